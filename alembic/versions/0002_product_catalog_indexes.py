@@ -0,0 +1,72 @@
+"""product catalog indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 02:20:11.418205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Built CONCURRENTLY so a large catalog stays writable during the migration;
+# that can't run inside a transaction, hence the autocommit block.
+ACTIVE = sa.text("is_active")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_active_created_at_id",
+            "products",
+            ["created_at", "id"],
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_products_active_category_price",
+            "products",
+            ["category_id", "price"],
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_products_active_price",
+            "products",
+            ["price"],
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_products_active_name_prefix",
+            "products",
+            [sa.text("lower(name) text_pattern_ops")],
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_products_name_category_id",
+            "products",
+            ["name", "category_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_products_name_category_id",
+            "ix_products_active_name_prefix",
+            "ix_products_active_price",
+            "ix_products_active_category_price",
+            "ix_products_active_created_at_id",
+        ):
+            op.drop_index(name, table_name="products", postgresql_concurrently=True)
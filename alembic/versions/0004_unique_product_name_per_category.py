@@ -0,0 +1,69 @@
+"""unique product name per category
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 04:12:37.520913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Bulk CSV import inserts with ON CONFLICT (name, category_id) WHERE is_active
+# DO NOTHING, which needs a unique index as its arbiter. Soft-deleted rows are
+# left out so their names can be reused.
+def upgrade() -> None:
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT count(*) FROM (SELECT 1 FROM products WHERE is_active "
+                "GROUP BY name, category_id HAVING count(*) > 1) d"
+            )
+        )
+        .scalar()
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} (name, category_id) pairs are used by more than one "
+            "active product; rename or merge them before upgrading"
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_products_name_category_id",
+            "products",
+            ["name", "category_id"],
+            unique=True,
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_products_name_category_id",
+            table_name="products",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_name_category_id",
+            "products",
+            ["name", "category_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "uq_products_name_category_id",
+            table_name="products",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,45 @@
+"""image keys and variants
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 06:10:02.731450
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("profile_picture_key", sa.String(), nullable=True))
+    op.add_column(
+        "users",
+        sa.Column(
+            "profile_picture_variants",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+        ),
+    )
+    op.add_column("products", sa.Column("image_key", sa.String(), nullable=True))
+    op.add_column(
+        "products",
+        sa.Column(
+            "image_variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "image_variants")
+    op.drop_column("products", "image_key")
+    op.drop_column("users", "profile_picture_variants")
+    op.drop_column("users", "profile_picture_key")
@@ -0,0 +1,35 @@
+"""unique otp email
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 06:40:11.208734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Before OTPs were upserted each resend inserted a new row. Only the most
+    # recent one per email is still the code the user was sent.
+    op.execute(
+        "DELETE FROM otps AS older USING otps AS newer "
+        "WHERE older.email = newer.email AND older.id < newer.id"
+    )
+    op.drop_index("ix_otps_email", table_name="otps")
+    op.create_index("ix_otps_email", "otps", ["email"], unique=True)
+    op.create_index("ix_otps_expires_at_id", "otps", ["expires_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_otps_expires_at_id", table_name="otps")
+    op.drop_index("ix_otps_email", table_name="otps")
+    op.create_index("ix_otps_email", "otps", ["email"], unique=False)
@@ -0,0 +1,66 @@
+"""backfill image keys
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 07:31:08.604127
+
+"""
+
+from typing import Optional, Sequence, Union
+from urllib.parse import unquote, urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# (table, URL column, key column, bucket)
+COLUMNS = [
+    ("products", "image_url", "image_key", "product-images"),
+    ("users", "profile_picture", "profile_picture_key", "profile-info"),
+]
+
+
+# Uploads used to store a presigned URL, which stops working after it expires.
+# The object key is in its path: /<bucket>/<key> on LocalStack, or /<key> on
+# <bucket>.s3...amazonaws.com. Anything else (e.g. a Google avatar) is kept.
+def object_key(url: str, bucket: str) -> Optional[str]:
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+    if (parts.hostname or "").startswith(f"{bucket}.s3"):
+        return path.lstrip("/") or None
+    if path.startswith(f"/{bucket}/"):
+        return path[len(bucket) + 2 :] or None
+    return None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, url_column, key_column, bucket in COLUMNS:
+        select = sa.text(
+            f"SELECT id, {url_column} FROM {table} "
+            f"WHERE {key_column} IS NULL AND {url_column} IS NOT NULL "
+            "AND id > :after ORDER BY id LIMIT :limit"
+        )
+        update = sa.text(f"UPDATE {table} SET {key_column} = :key WHERE id = :id")
+        after = "00000000-0000-0000-0000-000000000000"
+        while rows := bind.execute(select, {"after": after, "limit": BATCH_SIZE}).all():
+            keys = [
+                {"id": id, "key": key}
+                for id, url in rows
+                if (key := object_key(url, bucket))
+            ]
+            if keys:
+                bind.execute(update, keys)
+            after = rows[-1].id
+
+
+def downgrade() -> None:
+    # The keys stay valid for the older code, which ignores them
+    pass
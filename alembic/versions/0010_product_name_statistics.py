@@ -0,0 +1,32 @@
+"""product name statistics
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 09:12:37.402518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The planner ignores the statistics of partial indexes, so without these
+    # it guesses how many names match lower(name) LIKE 'x%'. Guessing high
+    # makes it walk the whole created_at index instead of using
+    # ix_products_active_name_prefix. Expression statistics need PostgreSQL 14+.
+    op.execute(
+        "CREATE STATISTICS st_products_lower_name ON (lower(name)) FROM products"
+    )
+    op.execute("ANALYZE products")
+
+
+def downgrade() -> None:
+    op.execute("DROP STATISTICS st_products_lower_name")
@@ -13,13 +13,16 @@ from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from . import schema, repository
 from ....core.security import (
-    verify_password,
+    verify_password_async,
     create_access_token,
-    get_password_hash,
+    hash_password_async,
     decode_token,
 )
 from ....db.session import get_db
-from ....services.mock_email_service import send_otp_email
+from ....core.http_client import get_http_client
+from ....core.rate_limit import limit_by_ip, limit_by_email, bcrypt_admission
+import httpx
+from ....services.email_queue import enqueue_otp_email
 from fastapi.responses import JSONResponse, RedirectResponse
 from .service import get_google_authorize_url
 from ....utils.utils import generate_otp
@@ -27,11 +30,15 @@ from .repository import handle_google_callback
 from pydantic import EmailStr
 from ....core.security import validate_password_strength
 from ....services.s3_service import save_profile_info
+from ....services.image_variants import schedule_profile_variants
 
 router = APIRouter(tags=["User Registration"])
 
 
-@router.post("/auth/register")
+@router.post(
+    "/auth/register",
+    dependencies=[Depends(limit_by_ip("register")), Depends(bcrypt_admission)],
+)
 async def register(
     name: str = Form(...),
     email: EmailStr = Form(...),
@@ -39,6 +46,7 @@ async def register(
     profile_picture: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
 ):
+    await limit_by_email("register", email)
     try:
         validate_password_strength(password)
     except ValueError as e:
@@ -47,15 +55,18 @@ async def register(
     if user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(password)
-    profile_picture_name = await save_profile_info(profile_picture)
+    hashed_password = await hash_password_async(password)
+    profile_picture_key = await save_profile_info(profile_picture)
 
-    # Pass saved image path (not file object) to DB
-    await repository.create_user(db, name, email, hashed_password, profile_picture_name)
+    # Pass saved object key (not file object) to DB
+    user = await repository.create_user(
+        db, name, email, hashed_password, profile_picture_key
+    )
+    schedule_profile_variants(user.id, profile_picture_key)
 
     otp = generate_otp()
     await repository.store_otp(db, email, otp)
-    await send_otp_email(email, otp)
+    await enqueue_otp_email(email, otp)
 
     return {"msg": "OTP sent for email verification"}
 
@@ -74,23 +85,28 @@ async def verify_email(
     return JSONResponse(status_code=201, content={"msg": "Email verified successfully"})
 
 
-@router.post("/auth/login", response_model=schema.TokenResponse)
+@router.post(
+    "/auth/login",
+    response_model=schema.TokenResponse,
+    dependencies=[Depends(limit_by_ip("login")), Depends(bcrypt_admission)],
+)
 async def login(
     data: schema.LoginRequest,
     db: AsyncSession = Depends(get_db),
     access_token: str = Cookie(default=None),
 ):
+    await limit_by_email("login", data.email)
 
     if access_token:
         try:
             payload = decode_token(access_token)
-            if payload.get("user_id"):
+            if payload and payload.get("user_id"):
                 raise HTTPException(status_code=400, detail="User already logged in")
         except JWTError:
             pass
 
     user = await repository.get_user_by_email(db, data.email)
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_password_async(data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     if not user.is_verified:
         raise HTTPException(status_code=403, detail="Email not verified")
@@ -125,7 +141,7 @@ async def resend_otp(email: str, db: AsyncSession = Depends(get_db)):
     otp = generate_otp()
     await repository.update_otp(db, email, otp)
 
-    await send_otp_email(email, otp)
+    await enqueue_otp_email(email, otp)
 
     return {"msg": "OTP sent successfully"}
 
@@ -140,7 +156,7 @@ async def forgot_password(
 
     otp = generate_otp()
     await repository.store_otp(db, data.email, otp)
-    await send_otp_email(data.email, otp)
+    await enqueue_otp_email(data.email, otp)
     return {"msg": "OTP sent to your email for password reset"}
 
 
@@ -150,21 +166,26 @@ async def logout(response: Response):
     return {"msg": "Logout successful"}
 
 
-@router.put("/auth/reset-password")
+@router.put(
+    "/auth/reset-password",
+    dependencies=[Depends(limit_by_ip("reset_password")), Depends(bcrypt_admission)],
+)
 async def reset_password(
     data: schema.ResetPasswordRequest, db: AsyncSession = Depends(get_db)
 ):
-    # Verify OTP
-    valid = await repository.verify_otp(db, data.email, data.otp)
-    if not valid:
-        raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+    await limit_by_email("reset_password", data.email)
+    # Validate first so a weak password doesn't burn the single-use OTP
     try:
         validate_password_strength(data.new_password)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    # Verify OTP
+    valid = await repository.verify_otp(db, data.email, data.otp)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
     # Update password
-    hashed = get_password_hash(data.new_password)
+    hashed = await hash_password_async(data.new_password)
     await repository.update_user_password(db, data.email, hashed)
     return {"msg": "Password reset successfully"}
 
@@ -175,5 +196,9 @@ async def google_login():
 
 
 @router.get("/api/v1/auth/google/callback")
-async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
-    return await handle_google_callback(request, db)
+async def google_callback(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
+    return await handle_google_callback(request, db, client)
@@ -0,0 +1,97 @@
+import asyncio
+import re
+import time
+from typing import Optional
+from jose import jwt, JWTError
+from ....core.config import settings
+from ....core.http_client import get_http_client
+from ....core.metrics import register_collector
+
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+# Refresh this long before max-age runs out so logins never wait on Google
+REFRESH_AHEAD_SECONDS = 60
+# Unknown "kid" forces a refetch (key rotation), but at most this often
+MIN_FORCED_REFRESH_SECONDS = 30
+DEFAULT_MAX_AGE_SECONDS = 3600
+
+_jwks = {"keys": None, "expires_at": 0.0, "fetched_at": 0.0}
+_refresh_lock = asyncio.Lock()
+_background_refresh: Optional[asyncio.Task] = None
+_stats = {"fetches": 0, "fetch_errors": 0, "verified": 0, "rejected": 0}
+
+
+def _parse_max_age(cache_control: str) -> int:
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE_SECONDS
+
+
+async def _fetch_jwks():
+    async with _refresh_lock:
+        response = await get_http_client().get(settings.GOOGLE_JWKS_URL)
+        response.raise_for_status()
+        now = time.monotonic()
+        _jwks["keys"] = response.json()
+        _jwks["fetched_at"] = now
+        _jwks["expires_at"] = now + _parse_max_age(
+            response.headers.get("cache-control")
+        )
+        _stats["fetches"] += 1
+
+
+async def _refresh_in_background():
+    try:
+        await _fetch_jwks()
+    except Exception:
+        # Keep serving the previous key set; the next login retries
+        _stats["fetch_errors"] += 1
+
+
+def _schedule_refresh():
+    global _background_refresh
+    if _background_refresh is None or _background_refresh.done():
+        _background_refresh = asyncio.create_task(_refresh_in_background())
+
+
+async def get_google_jwks(force: bool = False) -> dict:
+    now = time.monotonic()
+    if _jwks["keys"] is None:
+        await _fetch_jwks()
+    elif force and now - _jwks["fetched_at"] > MIN_FORCED_REFRESH_SECONDS:
+        await _fetch_jwks()
+    elif now > _jwks["expires_at"] - REFRESH_AHEAD_SECONDS:
+        _schedule_refresh()
+    return _jwks["keys"]
+
+
+def _has_key(jwks: dict, kid: Optional[str]) -> bool:
+    return any(key.get("kid") == kid for key in jwks.get("keys", []))
+
+
+async def verify_google_id_token(id_token: str, access_token: str = None) -> dict:
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        jwks = await get_google_jwks()
+        if not _has_key(jwks, kid):
+            jwks = await get_google_jwks(force=True)
+
+        claims = jwt.decode(
+            id_token,
+            jwks,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            access_token=access_token,
+        )
+    except JWTError:
+        _stats["rejected"] += 1
+        raise
+    _stats["verified"] += 1
+    return claims
+
+
+def get_google_jwks_stats() -> dict:
+    return {**_stats, "cached_keys": len((_jwks["keys"] or {}).get("keys", []))}
+
+
+register_collector("google_jwks", get_google_jwks_stats)
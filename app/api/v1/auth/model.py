@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Integer, Index
 from ....db.base import Base
 from datetime import datetime, timezone
 
@@ -6,9 +6,15 @@ from datetime import datetime, timezone
 class OTP(Base):
     __tablename__ = "otps"
     id = Column(Integer, nullable=False, primary_key=True)
-    email = Column(String, index=True)
+    # One outstanding OTP per email; re-issuing a code upserts this row
+    email = Column(String, unique=True, index=True)
     otp = Column(String)
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
     expires_at = Column(DateTime)
+
+    __table_args__ = (
+        # Lets the purge task walk expired rows in batches without a table scan
+        Index("ix_otps_expires_at_id", "expires_at", "id"),
+    )
@@ -2,13 +2,20 @@ from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from .model import OTP
 from sqlalchemy.future import select
-from datetime import datetime, timedelta
-from ....core.security import get_password_hash, create_access_token
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta, timezone
+from ....core.security import hash_password_async, create_access_token
 import httpx
 from ....core.config import settings
 from fastapi.responses import JSONResponse
 from ..user.model import User
+from ..user.cache import invalidate_user
 from ....services.s3_service import save_profile_info
+from ....utils.utils import download_image_as_upload_file
+from ....services.image_variants import schedule_profile_variants
+from .google_verifier import verify_google_id_token
+from jose import JWTError
 
 
 async def get_user_by_email(db: AsyncSession, email: str):
@@ -21,13 +28,13 @@ async def create_user(
     name: str,
     email: str,
     hashed_password: str,
-    profile_picture: str = None,
+    profile_picture_key: str = None,
 ):
     user = User(
         name=name,
         email=email,
         hashed_password=hashed_password,
-        profile_picture=profile_picture,
+        profile_picture_key=profile_picture_key,
     )
     db.add(user)
     await db.commit()
@@ -35,31 +42,59 @@ async def create_user(
     return user
 
 
+# expires_at is a naive UTC timestamp, so compare against UTC "now" in SQL
+_utc_now = func.timezone("utc", func.now())
+
+
 async def store_otp(db: AsyncSession, email: str, otp: str):
-    expiry = datetime.utcnow() + timedelta(minutes=10)
-    db.add(OTP(email=email, otp=otp, expires_at=expiry))
+    expiry = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
+    stmt = insert(OTP).values(
+        email=email, otp=otp, expires_at=expiry, created_at=datetime.now(timezone.utc)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OTP.email],
+        set_={
+            "otp": stmt.excluded.otp,
+            "expires_at": stmt.excluded.expires_at,
+            "created_at": stmt.excluded.created_at,
+        },
+    )
+    await db.execute(stmt)
     await db.commit()
 
 
 async def update_otp(db: AsyncSession, email: str, otp: str):
-    expiry = datetime.utcnow() + timedelta(minutes=10)
-    await db.execute(
-        OTP.__table__.update()
-        .where(OTP.email == email)
-        .values(otp=otp, expires_at=expiry)
+    await store_otp(db, email, otp)
+
+
+# Consumes the OTP: a code can only be verified once
+async def verify_otp(db: AsyncSession, email: str, otp: str):
+    result = await db.execute(
+        delete(OTP)
+        .where(OTP.email == email, OTP.otp == otp, OTP.expires_at > _utc_now)
+        .returning(OTP.id)
     )
     await db.commit()
+    return result.scalar_one_or_none()
 
 
-async def verify_otp(db: AsyncSession, email: str, otp: str):
-    stmt = select(OTP).where(OTP.email == email, OTP.otp == otp)
-    result = await db.execute(stmt)
-    return result.scalars().first()
+async def purge_expired_otps(db: AsyncSession, batch_size: int) -> int:
+    expired_ids = (
+        select(OTP.id)
+        .where(OTP.expires_at <= _utc_now)
+        .order_by(OTP.expires_at)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    result = await db.execute(delete(OTP).where(OTP.id.in_(expired_ids)))
+    await db.commit()
+    return result.rowcount
 
 
 async def mark_user_verified(db: AsyncSession, user: User):
     user.is_verified = True
     await db.commit()
+    invalidate_user(user.id)
 
 
 async def update_user_password(db: AsyncSession, email: str, new_hashed_pw: str):
@@ -67,6 +102,7 @@ async def update_user_password(db: AsyncSession, email: str, new_hashed_pw: str)
     if user:
         user.hashed_password = new_hashed_pw
         await db.commit()
+        invalidate_user(user.id)
 
 
 async def get_or_create_user_from_google(user_info: dict, db: AsyncSession) -> User:
@@ -82,16 +118,19 @@ async def get_or_create_user_from_google(user_info: dict, db: AsyncSession) -> U
             profile_picture=user_info.get("picture"),
             is_verified=True,
             auth_provider="google",
-            hashed_password=get_password_hash("Hello@123"),  # Random secure password
+            # Random secure password
+            hashed_password=await hash_password_async("Hello@123"),
         )
         profile_pic_url = user_info.get("picture")
         if profile_pic_url:
-            dummy_upload_file = await save_profile_info(profile_pic_url)
+            # Optional: keep our own copy of the picture
+            picture = await download_image_as_upload_file(profile_pic_url)
+            user.profile_picture_key = await save_profile_info(picture)
 
-        await save_profile_info(dummy_upload_file)  # Optional: store picture
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        schedule_profile_variants(user.id, user.profile_picture_key)
     else:
         # Update existing user only if needed
         updated = False
@@ -114,37 +153,42 @@ async def get_or_create_user_from_google(user_info: dict, db: AsyncSession) -> U
 
         if updated:
             await db.commit()
+            invalidate_user(user.id)
             await db.refresh(user)
 
     return user
 
 
-async def handle_google_callback(request: Request, db: AsyncSession):
+async def handle_google_callback(
+    request: Request, db: AsyncSession, client: httpx.AsyncClient
+):
     code = request.query_params.get("code")
     if not code:
         return JSONResponse({"error": "Missing code"}, status_code=400)
 
-    async with httpx.AsyncClient() as client:
-        token_res = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                "grant_type": "authorization_code",
-            },
-        )
-        token_json = token_res.json()
-        id_token = token_json.get("id_token")
+    token_res = await client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "code": code,
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            "grant_type": "authorization_code",
+        },
+    )
+    token_json = token_res.json()
+    id_token = token_json.get("id_token")
 
-        if not id_token:
-            return JSONResponse({"error": "Missing ID token"}, status_code=400)
+    if not id_token:
+        return JSONResponse({"error": "Missing ID token"}, status_code=400)
 
-        user_info_res = await client.get(
-            f"https://www.googleapis.com/oauth2/v3/tokeninfo?id_token={id_token}"
+    # Verified locally against Google's cached signing keys
+    try:
+        user_info = await verify_google_id_token(
+            id_token, token_json.get("access_token")
         )
-        user_info = user_info_res.json()
+    except JWTError:
+        return JSONResponse({"error": "Invalid ID token"}, status_code=400)
 
     user = await get_or_create_user_from_google(user_info, db)
 
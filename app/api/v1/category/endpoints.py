@@ -1,28 +1,65 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from ....db.session import get_db
 from . import schema, repository
 from ..user.service import get_current_user
+from ....core.responses import FastJSONResponse
+from ....core.conditional import (
+    has_conditional_headers,
+    is_not_modified,
+    not_modified,
+    row_validators,
+    rows_etag,
+    set_validators,
+)
 from ..user.model import User
 from uuid import UUID
 
 router = APIRouter(tags=["Categories"])
 
 
-@router.get("/categories", response_model=list[schema.CategoryOut])
+# Rows are serialized straight to orjson; response_model only documents the shape
+@router.get(
+    "/categories",
+    response_model=list[schema.CategoryOut],
+    response_class=FastJSONResponse,
+)
 async def list_categories(
-    db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
 ):
-    return await repository.get_all_categories(db)
+    if has_conditional_headers(request):
+        etag = rows_etag(await repository.get_categories_metadata(db))
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    categories = await repository.get_all_categories(db)
+    return set_validators(
+        FastJSONResponse([schema.serialize_category(c) for c in categories]),
+        rows_etag((c.id, c.updated_at) for c in categories),
+    )
 
 
 @router.get("/category/{id}", response_model=schema.CategoryOut)
 async def get_category(
-    id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+    id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
 ):
+    if has_conditional_headers(request, last_modified=True):
+        row = await repository.get_category_metadata(db, id)
+        if row:
+            etag, last_modified = row_validators(*row)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified(etag, last_modified)
+
     category = await repository.get_category(db, id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
+    set_validators(response, *row_validators(category.id, category.updated_at))
     return category
 
 
@@ -3,15 +3,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from .model import Category
 from ..product.model import Product
+from ..product.cache import bump_catalog_version
 from . import schema
 from uuid import UUID
 
 
 async def get_all_categories(db: AsyncSession):
-    result = await db.execute(select(Category))
+    # Stable order so the list ETag only changes with the data
+    result = await db.execute(select(Category).order_by(Category.id))
     return result.scalars().all()
 
 
+async def get_categories_metadata(db: AsyncSession):
+    result = await db.execute(
+        select(Category.id, Category.updated_at).order_by(Category.id)
+    )
+    return result.all()
+
+
 async def get_category(db: AsyncSession, id: UUID):
     result = await db.execute(select(Category).where(Category.id == id))
     if not result:
@@ -19,6 +28,13 @@ async def get_category(db: AsyncSession, id: UUID):
     return result.scalar_one_or_none()
 
 
+async def get_category_metadata(db: AsyncSession, id: UUID):
+    result = await db.execute(
+        select(Category.id, Category.updated_at).where(Category.id == id)
+    )
+    return result.one_or_none()
+
+
 async def create_category(db: AsyncSession, data: schema.CategoryCreate):
     # Check if category already exists
     result = await db.execute(select(Category).where(Category.name == data.name))
@@ -46,6 +62,8 @@ async def update_category(db: AsyncSession, id: UUID, data: schema.CategoryUpdat
         setattr(category, key, value)
 
     await db.commit()
+    # Facets carry category names
+    await bump_catalog_version()
     await db.refresh(category)
     return category
 
@@ -68,4 +86,5 @@ async def delete_category(db: AsyncSession, id: UUID):
     # Step 3: Delete and commit
     await db.delete(category)
     await db.commit()
+    await bump_catalog_version()
     return True
@@ -23,3 +23,14 @@ class CategoryOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# CategoryOut's JSON shape built straight from trusted rows, without validation
+def serialize_category(category) -> dict:
+    return {
+        "id": category.id,
+        "name": category.name,
+        "description": category.description,
+        "created_at": category.created_at,
+        "updated_at": category.updated_at,
+    }
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....db.session import get_db
+from . import schema, repository
+from ..user.service import get_current_user
+from ..user.model import User
+from uuid import UUID
+
+router = APIRouter(tags=["Imports"])
+
+
+@router.get("/imports/{id}", response_model=schema.ImportJobOut)
+async def get_import(
+    id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+):
+    job = await repository.get_job(db, id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
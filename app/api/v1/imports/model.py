@@ -0,0 +1,48 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, text
+from ....db.base import Base
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(String(255), nullable=False)
+    # Uploaded CSV in the product-imports bucket, deleted once the job ends
+    object_key = Column(String, nullable=False)
+    # pending -> running -> completed | failed
+    status = Column(String(20), nullable=False, default="pending")
+    # Data rows covered by committed chunks; a resumed job skips this many
+    rows_processed = Column(Integer, nullable=False, default=0)
+    added = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    # First IMPORT_MAX_ERRORS row errors: [{"row": n, "error": "..."}]
+    errors = Column(JSONB, nullable=False, default=list)
+    # Why a job failed as a whole (bad header, undecodable file)
+    detail = Column(Text, nullable=True)
+    # Lease held by the worker running the job; an expired lease means the
+    # worker died and any worker may resume the job
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    # Times the job was claimed; a shutdown that releases it gives one back
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Workers look for the oldest unfinished job
+        Index(
+            "ix_import_jobs_unfinished_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....core.config import settings
+from .model import ImportJob
+
+UNFINISHED = ("pending", "running")
+
+
+def _lease_expiry():
+    return func.now() + timedelta(seconds=settings.IMPORT_LEASE_SECONDS)
+
+
+async def create_job(db: AsyncSession, filename: str, object_key: str) -> ImportJob:
+    job = ImportJob(filename=filename, object_key=object_key)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_job(db: AsyncSession, id: UUID) -> Optional[ImportJob]:
+    result = await db.execute(select(ImportJob).where(ImportJob.id == id))
+    return result.scalar_one_or_none()
+
+
+# Leases the oldest unfinished job nobody holds. SKIP LOCKED lets several
+# workers claim concurrently without picking the same job.
+async def claim_next_job(db: AsyncSession, worker_id: str) -> Optional[ImportJob]:
+    candidate = (
+        select(ImportJob.id)
+        .where(
+            ImportJob.status.in_(UNFINISHED),
+            or_(ImportJob.locked_until.is_(None), ImportJob.locked_until < func.now()),
+        )
+        .order_by(ImportJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == candidate)
+        .values(
+            status="running",
+            locked_by=worker_id,
+            locked_until=_lease_expiry(),
+            attempts=ImportJob.attempts + 1,
+        )
+        .returning(ImportJob)
+        .execution_options(synchronize_session=False)
+    )
+    job = result.scalar_one_or_none()
+    await db.commit()
+    return job
+
+
+# Saves progress in the chunk's own transaction and renews the lease. Returns
+# False if the lease was lost, in which case the caller must roll back.
+async def record_progress(
+    db: AsyncSession,
+    job: ImportJob,
+    worker_id: str,
+    rows_processed: int,
+    added: int,
+    skipped: int,
+    error_count: int,
+    errors: List[dict],
+) -> bool:
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job.id, ImportJob.locked_by == worker_id)
+        .values(
+            rows_processed=rows_processed,
+            added=added,
+            skipped=skipped,
+            error_count=error_count,
+            errors=errors,
+            locked_until=_lease_expiry(),
+        )
+    )
+    return result.rowcount == 1
+
+
+async def finish_job(
+    db: AsyncSession, id: UUID, worker_id: str, status: str, detail: str = None
+):
+    await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == id, ImportJob.locked_by == worker_id)
+        .values(
+            status=status,
+            detail=detail,
+            locked_by=None,
+            locked_until=None,
+            finished_at=func.now(),
+        )
+    )
+    await db.commit()
+
+
+# Drops this worker's leases so a restart resumes its jobs straight away. The
+# interrupted attempt wasn't the job's fault, so it doesn't count.
+async def release_jobs(db: AsyncSession, worker_id: str):
+    await db.execute(
+        update(ImportJob)
+        .where(ImportJob.locked_by == worker_id, ImportJob.status.in_(UNFINISHED))
+        .values(locked_by=None, locked_until=None, attempts=ImportJob.attempts - 1)
+    )
+    await db.commit()
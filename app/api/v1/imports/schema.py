@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class RowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportJobOut(BaseModel):
+    id: UUID
+    filename: str
+    status: str
+    rows_processed: int
+    added: int
+    skipped: int
+    error_count: int
+    errors: List[RowError]
+    detail: Optional[str]
+    attempts: int
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class ImportJobCreated(BaseModel):
+    job_id: UUID
+    status_url: str
@@ -0,0 +1,199 @@
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol
+from uuid import UUID
+from cachetools import TTLCache
+from pydantic import BaseModel, TypeAdapter
+from ....core.config import settings
+from ....core.metrics import register_collector
+
+VERSION_KEY = "catalog:version"
+
+
+# Column snapshot of a Product as stored in the cache. Keys, not signed URLs,
+# are cached so hits never serve an expired link.
+class CachedProduct(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str]
+    price: Decimal
+    stock: Optional[int]
+    category_id: UUID
+    image_url: Optional[str]
+    image_key: Optional[str]
+    image_variants: Optional[Dict[str, Dict[str, str]]]
+    is_active: Optional[bool]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CatalogCacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: int): ...
+
+    async def get_version(self) -> int: ...
+
+    async def bump_version(self) -> int: ...
+
+
+class InMemoryCatalogCacheBackend:
+    def __init__(self, max_size: int, ttl: int):
+        self._entries = TTLCache(maxsize=max_size, ttl=ttl)
+        self._version = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        self._entries[key] = value
+
+    async def get_version(self) -> int:
+        return self._version
+
+    async def bump_version(self) -> int:
+        self._version += 1
+        # Entries under the old stamp can never be read again
+        self._entries.clear()
+        return self._version
+
+
+# Shares entries and the version stamp across workers. Takes any client with
+# the redis.asyncio get/set/incr API, so tests can pass a local stand-in.
+class RedisCatalogCacheBackend:
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str):
+        import redis.asyncio as redis  # Optional dependency
+
+        # Short timeouts: a slow cache is worse than none, see read_through
+        timeout = settings.CATALOG_CACHE_TIMEOUT_SECONDS
+        return cls(
+            redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        await self.client.set(key, value, ex=ttl)
+
+    async def get_version(self) -> int:
+        return int(await self.client.get(VERSION_KEY) or 0)
+
+    async def bump_version(self) -> int:
+        return await self.client.incr(VERSION_KEY)
+
+
+def _default_backend() -> CatalogCacheBackend:
+    shared = settings.WEB_CONCURRENCY > 1
+    backend = settings.CATALOG_CACHE_BACKEND or ("redis" if shared else "memory")
+    if backend == "redis":
+        try:
+            return RedisCatalogCacheBackend.from_url(settings.CATALOG_CACHE_URL)
+        except ImportError:
+            if settings.CATALOG_CACHE_BACKEND:
+                raise
+            logging.warning("redis is not installed; caching the catalog per worker")
+    ttl = settings.CATALOG_CACHE_TTL_SECONDS
+    if shared:
+        # Version bumps only reach this worker's copy
+        ttl = min(ttl, settings.CATALOG_CACHE_LOCAL_TTL_SECONDS)
+    return InMemoryCatalogCacheBackend(settings.CATALOG_CACHE_MAX_SIZE, ttl)
+
+
+_backend: CatalogCacheBackend = _default_backend()
+_hits = Counter()
+_misses = Counter()
+_errors = Counter()
+
+
+def set_catalog_cache_backend(backend: CatalogCacheBackend):
+    global _backend
+    _backend = backend
+
+
+# Equivalent filter combinations map to the same cache key
+def normalize_filters(
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+    **extra,
+) -> tuple:
+    search = search.strip().lower() if search else None
+    return (
+        str(category_id) if category_id else None,
+        float(min_price) if min_price else None,
+        float(max_price) if max_price else None,
+        search or None,
+        *sorted(extra.items()),
+    )
+
+
+# The cache fails open: if the backend errors, reads go to the database and
+# writes still succeed
+async def read_through(
+    kind: str,
+    key: tuple,
+    adapter: TypeAdapter,
+    loader: Callable[[], Awaitable[Any]],
+):
+    cache_key = None
+    try:
+        version = await _backend.get_version()
+        cache_key = f"catalog:{version}:{kind}:{json.dumps(key, default=str)}"
+        raw = await _backend.get(cache_key)
+    except Exception:
+        _errors[kind] += 1
+        logging.warning("Catalog cache read failed", exc_info=True)
+        raw = None
+    if raw is not None:
+        _hits[kind] += 1
+        return adapter.validate_json(raw)
+
+    _misses[kind] += 1
+    value = adapter.validate_python(await loader(), from_attributes=True)
+    if cache_key is not None:
+        try:
+            await _backend.set(
+                cache_key, adapter.dump_json(value), settings.CATALOG_CACHE_TTL_SECONDS
+            )
+        except Exception:
+            _errors[kind] += 1
+            logging.warning("Catalog cache write failed", exc_info=True)
+    return value
+
+
+# Called after every committed catalog write
+async def bump_catalog_version():
+    try:
+        await _backend.bump_version()
+    except Exception:
+        # Stale entries still expire after CATALOG_CACHE_TTL_SECONDS
+        _errors["version"] += 1
+        logging.error("Catalog cache version bump failed", exc_info=True)
+
+
+def get_catalog_cache_stats() -> dict:
+    stats = {}
+    for kind in set(_hits) | set(_misses) | set(_errors):
+        total = _hits[kind] + _misses[kind]
+        stats[kind] = {
+            "hits": _hits[kind],
+            "misses": _misses[kind],
+            "errors": _errors[kind],
+            "hit_ratio": round(_hits[kind] / total, 4) if total else 0,
+        }
+    return stats
+
+
+register_collector("catalog_cache", get_catalog_cache_stats)
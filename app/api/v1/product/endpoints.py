@@ -1,104 +1,261 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    UploadFile,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from ....db.session import get_db
-from . import schema, repository
-from ....services.s3_service import save_product_image
+from . import schema, repository, importer, exporter
+from ..imports import schema as import_schema, repository as import_repository
+from ....services.s3_service import (
+    save_product_image,
+    save_import_file,
+    presign_urls,
+    presigned_url_epoch,
+    PRODUCT_BUCKET,
+)
+from ....services.import_worker import notify_import_worker
+from ....services.image_variants import schedule_product_variants
 from ..user.service import get_current_user
+from ....core.responses import FastJSONResponse
+from fastapi.responses import StreamingResponse
+from ....core.conditional import (
+    has_conditional_headers,
+    is_not_modified,
+    not_modified,
+    rows_etag,
+    set_validators,
+)
 from ..user.model import User
 from uuid import UUID
 from sqlalchemy import select
 from ..category.model import Category
-from typing import Optional
+from typing import Dict, Literal, Optional, Union
 from .repository import delete_product
-from .model import Product
-import csv
-from io import StringIO
-from sqlalchemy.exc import SQLAlchemyError
+from .cache import CachedProduct, normalize_filters, read_through
+from pydantic import TypeAdapter
+import asyncio
 
 router = APIRouter(tags=["Products"])
 
+_product_list = TypeAdapter(list[CachedProduct])
+_single_product = TypeAdapter(Optional[CachedProduct])
+_facets = TypeAdapter(schema.ProductFacets)
 
-@router.post("/upload-csv")
+
+# Runs as a background job; poll the returned status_url for progress and
+# per-row errors
+@router.post(
+    "/upload-csv", status_code=202, response_model=import_schema.ImportJobCreated
+)
 async def upload_csv(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only CSV files are allowed")
 
-    content = await file.read()
-    decoded = content.decode("utf-8")
-    reader = csv.DictReader(StringIO(decoded))
+    try:
+        await asyncio.to_thread(importer.validate_header, file.file)
+    except importer.ImportRowError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    required_fields = {"name", "price", "stock", "category_id"}
-    if not required_fields.issubset(reader.fieldnames):
-        raise HTTPException(
-            status_code=400,
-            detail=f"CSV must include columns: {', '.join(required_fields)}",
-        )
+    object_key = await save_import_file(file)
+    job = await import_repository.create_job(db, file.filename, object_key)
+    notify_import_worker()
+    return {"job_id": job.id, "status_url": f"/imports/{job.id}"}
 
-    added = 0
-    skipped = 0
-    for row in reader:
-        try:
-            name = row["name"].strip()
-            category_id = UUID(row["category_id"])
-            # Check if product already exists
-            existing = await db.execute(
-                select(Product).where(
-                    Product.name == name, Product.category_id == category_id
-                )
-            )
-            existing_product = existing.scalar_one_or_none()
-
-            if existing_product:
-                skipped += 1
-                continue
-
-            product = Product(
-                name=name,
-                price=float(row["price"]),
-                stock=int(row["stock"]),
-                category_id=category_id,
-                description=row.get("description", "").strip() or None,
-                image_url=row.get("image_url", "").strip() or None,
-                is_active=row.get("is_active", "true").strip().lower() == "true",
+
+# Without `cursor` this returns a plain list paged by skip/limit. Passing
+# `cursor` (empty for the first page) switches to keyset pagination and
+# returns {"items": [...], "next_cursor": ...}.
+# Rows are serialized straight to orjson; response_model only documents the shape
+@router.get(
+    "/products",
+    response_model=Union[list[schema.ProductOut], schema.ProductPage],
+    response_class=FastJSONResponse,
+)
+async def list_products(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    category_id: Optional[UUID] = Query(None),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    user: User = Depends(get_current_user),
+):
+    filters = normalize_filters(category_id, min_price, max_price, search)
+    if cursor is None:
+        if has_conditional_headers(request):
+            rows = await repository.get_products_metadata(
+                db, skip, limit, category_id, min_price, max_price, search
             )
-            db.add(product)
-            added += 1
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Error in row: {row} — {e}")
+            etag = _etag(rows, "list")
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+
+        products = await read_through(
+            "products",
+            (filters, skip, limit),
+            _product_list,
+            lambda: repository.get_products(
+                db, skip, limit, category_id, min_price, max_price, search
+            ),
+        )
+        urls = await _sign_images(products)
+        return set_validators(
+            FastJSONResponse([schema.serialize_product(p, urls) for p in products]),
+            _etag(_rows(products), "list"),
+        )
 
     try:
-        await db.commit()
-    except SQLAlchemyError as e:
-        await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+        after = repository.decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"message": f"{added} products uploaded successfully", "skipped": skipped}
+    if has_conditional_headers(request):
+        rows = await repository.get_products_metadata(
+            db, 0, limit + 1, category_id, min_price, max_price, search, after
+        )
+        etag = _etag(rows, "page")
+        if is_not_modified(request, etag):
+            return not_modified(etag)
 
+    # One extra row tells us whether there is a next page
+    products = await read_through(
+        "products",
+        (filters, cursor, limit),
+        _product_list,
+        lambda: repository.get_products(
+            db, 0, limit + 1, category_id, min_price, max_price, search, after
+        ),
+    )
+    etag = _etag(_rows(products), "page")
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = repository.encode_cursor(products[-1])
+    urls = await _sign_images(products)
+    page = {
+        "items": [schema.serialize_product(p, urls) for p in products],
+        "next_cursor": next_cursor,
+    }
+    return set_validators(FastJSONResponse(page), etag)
 
-@router.get("/products", response_model=list[schema.ProductOut])
-async def list_products(
+
+def _rows(products):
+    return ((p.id, p.updated_at) for p in products)
+
+
+# Bodies carry presigned URLs, so the tag also changes with the signing epoch,
+# and is weak since workers sign independently. No Last-Modified, which can't
+# see URLs being re-signed.
+def _etag(rows, variant: str = "") -> str:
+    return rows_etag(rows, f"{variant}:{presigned_url_epoch()}", weak=True)
+
+
+def _image_keys(products):
+    for product in products:
+        yield product.image_key
+        for formats in (product.image_variants or {}).values():
+            yield from formats.values()
+
+
+# Signs a whole page's images in one trip off the event loop
+async def _sign_images(products) -> Dict[str, str]:
+    return await presign_urls(PRODUCT_BUCKET, _image_keys(products))
+
+
+@router.get("/products/facets", response_model=schema.ProductFacets)
+async def product_facets(
+    category_id: Optional[UUID] = Query(None),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    search: Optional[str] = Query(None),
+    price_bucket_size: float = Query(100, gt=0),
     db: AsyncSession = Depends(get_db),
-    skip: int = 0,
-    limit: int = 10,
+    user: User = Depends(get_current_user),
+):
+    return await read_through(
+        "facets",
+        normalize_filters(
+            category_id,
+            min_price,
+            max_price,
+            search,
+            price_bucket_size=price_bucket_size,
+        ),
+        _facets,
+        lambda: repository.get_product_facets(
+            db, category_id, min_price, max_price, search, price_bucket_size
+        ),
+    )
+
+
+# Whole filtered catalog as CSV (same columns /upload-csv reads) or NDJSON
+@router.get("/products/export")
+async def export_products(
+    format: Literal["csv", "ndjson"] = Query("csv"),
     category_id: Optional[UUID] = Query(None),
     min_price: Optional[float] = Query(None),
     max_price: Optional[float] = Query(None),
     search: Optional[str] = Query(None),
     user: User = Depends(get_current_user),
 ):
-    return await repository.get_products(
-        db, skip, limit, category_id, min_price, max_price, search
+    return StreamingResponse(
+        exporter.export_products(format, category_id, min_price, max_price, search),
+        media_type=exporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=products.{format}"},
+    )
+
+
+@router.get("/products/search", response_model=list[schema.ProductSearchHit])
+async def search_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    category_id: Optional[UUID] = Query(None),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    products = await repository.search_products(
+        db, q, limit, category_id, min_price, max_price
     )
+    urls = await _sign_images(products)
+    return [
+        {**schema.serialize_product(p, urls), "rank": p.rank, "snippet": p.snippet}
+        for p in products
+    ]
 
 
 @router.get("/product/{product_id}", response_model=schema.ProductOut)
 async def get_product(
-    id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+    id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
 ):
-    product = await repository.get_product(db, id)
+    if has_conditional_headers(request):
+        row = await repository.get_product_metadata(db, id)
+        if row:
+            etag = _etag([row])
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+
+    product = await read_through(
+        "product", (str(id),), _single_product, lambda: repository.get_product(db, id)
+    )
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    set_validators(response, _etag(_rows([product])))
+    return schema.serialize_product(product, await _sign_images([product]))
 
 
 @router.post("/product/", response_model=schema.ProductOut)
@@ -108,7 +265,7 @@ async def create_product(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    image_url = await save_product_image(image) if image else None
+    image_key = await save_product_image(image) if image else None
     if product_data.price <= 0:
         raise HTTPException(status_code=400, detail="Price must be greater than 0")
     result = await db.execute(
@@ -118,8 +275,21 @@ async def create_product(
 
     if not category:
         raise HTTPException(status_code=400, detail="Category ID is not valid")
-    new_product = await repository.create_product(db, product_data, image_url)
-    return new_product
+    new_product = await repository.create_product(db, product_data, image_key)
+    schedule_product_variants(new_product.id, image_key)
+    return schema.serialize_product(new_product, await _sign_images([new_product]))
+
+
+# Many creates/updates/soft-deletes in one transaction; per-item results come
+# back in request order
+@router.post("/products/batch", response_model=schema.ProductBatchResponse)
+async def batch_products(
+    batch: schema.ProductBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    results = await repository.apply_product_batch(db, batch.operations)
+    return {"results": results}
 
 
 @router.put("/product/{product_id}", response_model=schema.ProductOut)
@@ -130,14 +300,15 @@ async def update_product(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    image_url = None
+    image_key = None
     if image and image.filename:  # Only upload if a real file is given
-        image_url = await save_product_image(image)
+        image_key = await save_product_image(image)
 
-    product = await repository.update_product(db, id, product_data, image_url)
+    product = await repository.update_product(db, id, product_data, image_key)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    schedule_product_variants(product.id, image_key)
+    return schema.serialize_product(product, await _sign_images([product]))
 
 
 @router.delete("/product/{product_id}")
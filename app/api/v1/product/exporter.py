@@ -0,0 +1,61 @@
+import csv
+import io
+from typing import AsyncIterator
+from uuid import UUID
+import orjson
+from ....core.config import settings
+from ....core.responses import orjson_default
+from ....db.session import AsyncSessionLocal
+from . import repository
+
+# Import columns first, so an export can be fed back into /upload-csv
+COLUMNS = [
+    "name",
+    "description",
+    "price",
+    "stock",
+    "category_id",
+    "image_url",
+    "image_key",
+    "id",
+    "created_at",
+    "updated_at",
+]
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _csv_chunk(rows, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows([row[column] for column in COLUMNS] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(row), default=orjson_default, option=orjson.OPT_UTC_Z) + b"\n"
+        for row in rows
+    )
+
+
+# Streams active products one server-side cursor batch at a time, so memory
+# stays flat however large the catalog is. Opens its own session: the
+# request's session is closed before a streaming body is sent.
+async def export_products(
+    format: str,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+) -> AsyncIterator[bytes]:
+    batch_size = settings.EXPORT_BATCH_SIZE
+    async with AsyncSessionLocal() as db:
+        result = await repository.stream_products(
+            db, batch_size, category_id, min_price, max_price, search
+        )
+        if format == "csv":
+            yield _csv_chunk([], header=True)
+        async for rows in result.mappings().partitions(batch_size):
+            yield _csv_chunk(rows) if format == "csv" else _ndjson_chunk(rows)
@@ -0,0 +1,139 @@
+import asyncio
+import csv
+import io
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import BinaryIO, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..category.model import Category
+from .model import Product
+from .schema import ProductCreate
+
+REQUIRED_FIELDS = {"name", "price", "stock", "category_id"}
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    added: int = 0
+    skipped: int = 0
+    # [{"row": n, "error": "..."}], n counting data rows from 1
+    errors: List[dict] = field(default_factory=list)
+
+
+def _check_fields(fieldnames):
+    if not REQUIRED_FIELDS.issubset(fieldnames or ()):
+        raise ImportRowError(f"CSV must include columns: {', '.join(REQUIRED_FIELDS)}")
+
+
+# Rejects a bad upload up front, leaving the file rewound
+def validate_header(fileobj: BinaryIO):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    try:
+        _check_fields(csv.DictReader(text).fieldnames)
+    except UnicodeDecodeError:
+        raise ImportRowError("CSV must be UTF-8 encoded")
+    finally:
+        text.detach()
+        fileobj.seek(0)
+
+
+def open_csv(fileobj: BinaryIO) -> csv.DictReader:
+    # Decodes and parses incrementally; the file is never read whole
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    reader = csv.DictReader(text)
+    _check_fields(reader.fieldnames)
+    return reader
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors()
+    )
+
+
+# Same rules as POST /product, so a row that imports could also be created
+# one by one, and a bad row never reaches (and aborts) the batch INSERT
+def parse_row(row: dict) -> dict:
+    try:
+        product = ProductCreate(
+            name=(row.get("name") or "").strip(),
+            description=(row.get("description") or "").strip() or None,
+            price=(row.get("price") or "").strip(),
+            stock=(row.get("stock") or "").strip(),
+            category_id=(row.get("category_id") or "").strip(),
+        )
+    except ValidationError as e:
+        raise ImportRowError(_describe(e)) from e
+    return {
+        **product.model_dump(),
+        "image_url": (row.get("image_url") or "").strip() or None,
+        # Uploaded images, as exported by GET /products/export; signed on read
+        "image_key": (row.get("image_key") or "").strip() or None,
+        "is_active": (row.get("is_active") or "true").strip().lower() == "true",
+    }
+
+
+async def read_batch(reader: csv.DictReader, size: int) -> List[dict]:
+    # File reads and CSV parsing stay off the event loop
+    return await asyncio.to_thread(lambda: list(islice(reader, size)))
+
+
+async def skip_rows(reader: csv.DictReader, count: int):
+    await asyncio.to_thread(lambda: sum(1 for _ in islice(reader, count)))
+
+
+# One category lookup and one multi-row INSERT for the whole batch. Rows whose
+# (name, category_id) already exists are skipped by the database.
+async def insert_batch(db: AsyncSession, rows: List[Tuple[int, dict]]) -> ImportResult:
+    result = ImportResult()
+    category_ids = {values["category_id"] for _, values in rows}
+    found = await db.execute(select(Category.id).where(Category.id.in_(category_ids)))
+    unknown = category_ids - set(found.scalars())
+
+    valid = []
+    for number, values in rows:
+        if values["category_id"] in unknown:
+            error = f"Unknown category_id: {values['category_id']}"
+            result.errors.append({"row": number, "error": error})
+        else:
+            valid.append(values)
+    if not valid:
+        return result
+
+    stmt = (
+        insert(Product)
+        .on_conflict_do_nothing(
+            index_elements=["name", "category_id"], index_where=Product.is_active
+        )
+        .returning(Product.id)
+        # Keep NULLs so rows with different empty columns share one batch
+        .execution_options(render_nulls=True)
+    )
+    inserted = await db.execute(stmt, valid)
+    result.added = len(inserted.all())
+    result.skipped = len(valid) - result.added
+    return result
+
+
+# Imports one batch of raw CSV rows; bad rows are reported, not raised.
+# The caller commits.
+async def import_batch(
+    db: AsyncSession, batch: List[dict], first_row: int
+) -> ImportResult:
+    rows, errors = [], []
+    for number, raw in enumerate(batch, first_row):
+        try:
+            rows.append((number, parse_row(raw)))
+        except ImportRowError as e:
+            errors.append({"row": number, "error": str(e)})
+
+    result = await insert_batch(db, rows) if rows else ImportResult()
+    result.errors = sorted(errors + result.errors, key=lambda e: e["row"])
+    return result
@@ -7,11 +7,15 @@ from sqlalchemy import (
     Numeric,
     DateTime,
     Boolean,
+    Computed,
+    Index,
+    func,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime, timezone
 from ....db.base import Base
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 import uuid
 
 
@@ -28,7 +32,12 @@ class Product(Base):
         ForeignKey("categories.id", ondelete="CASCADE"),
         nullable=False,
     )
+    # External image URL (e.g. from a CSV import)
     image_url = Column(String, nullable=True)
+    # Object key in the product-images bucket; signed when read
+    image_key = Column(String, nullable=True)
+    # {"thumbnail": {"webp": key, "jpeg": key}, "medium": {...}}
+    image_variants = Column(JSONB, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -39,4 +48,66 @@ class Product(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    # Kept in sync by Postgres; name matches rank above description. Only
+    # used inside search queries, so it is never loaded with the row
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
     category = relationship("Category", back_populates="products")
+
+    # Every catalog read filters on is_active, so the listing indexes are
+    # partial and skip soft-deleted rows entirely
+    __table_args__ = (
+        # Listing order; backs keyset pagination on GET /products
+        Index(
+            "ix_products_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_active_category_price",
+            "category_id",
+            "price",
+            postgresql_where=text("is_active"),
+        ),
+        Index("ix_products_active_price", "price", postgresql_where=text("is_active")),
+        # Case-insensitive prefix search: lower(name) LIKE 'x%'
+        Index(
+            "ix_products_active_name_prefix",
+            func.lower(name).label("lower_name"),
+            postgresql_ops={"lower_name": "text_pattern_ops"},
+            postgresql_where=text("is_active"),
+        ),
+        # Full-text search and typo-tolerant (pg_trgm) name matching
+        Index(
+            "ix_products_active_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_active_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=text("is_active"),
+        ),
+        # Arbiter for ON CONFLICT DO NOTHING in the bulk CSV import. Only
+        # active rows, so a soft-deleted product doesn't block reusing its name
+        Index(
+            "uq_products_name_category_id",
+            "name",
+            "category_id",
+            unique=True,
+            postgresql_where=text("is_active"),
+        ),
+    )
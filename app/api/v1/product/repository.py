@@ -1,23 +1,28 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
-from sqlalchemy import and_
+from sqlalchemy import and_, func, literal, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from . import schema
-from uuid import UUID
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+import base64
+import json
 from .model import Product
+from ..category.model import Category
+from .cache import bump_catalog_version
 
 
-# GET PRODUCTS (Only active)
-async def get_products(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 10,
+def _apply_product_filters(
+    query,
     category_id: UUID = None,
     min_price: float = None,
     max_price: float = None,
     search: str = None,
 ):
-    query = select(Product).where(Product.is_active)
+    query = query.where(Product.is_active)
 
     filters = []
     if category_id:
@@ -26,17 +31,239 @@ async def get_products(
         filters.append(Product.price >= min_price)
     if max_price:
         filters.append(Product.price <= max_price)
-    if search:
-        filters.append(Product.name.ilike(f"{search}%"))
+    if search and search.strip():
+        # Same match as ILIKE 'x%', but can use the lower(name) prefix index
+        filters.append(func.lower(Product.name).like(f"{search.strip().lower()}%"))
 
     if filters:
         query = query.where(and_(*filters))
+    return query
+
+
+# Opaque keyset cursor over the listing order (created_at, id)
+def encode_cursor(product: Product) -> str:
+    raw = json.dumps([product.created_at.isoformat(), str(product.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
-    query = query.offset(skip).limit(limit)
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _product_page_query(
+    query,
+    skip: int,
+    limit: int,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+):
+    query = _apply_product_filters(query, category_id, min_price, max_price, search)
+
+    # Newest first; `after` seeks past the cursor instead of counting OFFSET rows
+    if after:
+        query = query.where(tuple_(Product.created_at, Product.id) < after)
+    query = query.order_by(Product.created_at.desc(), Product.id.desc())
+
+    return query.offset(skip).limit(limit)
+
+
+# GET PRODUCTS (Only active)
+async def get_products(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+):
+    query = _product_page_query(
+        select(Product),
+        skip,
+        limit,
+        category_id,
+        min_price,
+        max_price,
+        search,
+        after,
+    )
     result = await db.execute(query)
     return result.scalars().all()
 
 
+# (id, updated_at) of the same page, for conditional GETs
+async def get_products_metadata(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+):
+    query = _product_page_query(
+        select(Product.id, Product.updated_at),
+        skip,
+        limit,
+        category_id,
+        min_price,
+        max_price,
+        search,
+        after,
+    )
+    result = await db.execute(query)
+    return result.all()
+
+
+# Active products through a server-side cursor, fetched `batch_size` rows
+# at a time, in listing order
+async def stream_products(
+    db: AsyncSession,
+    batch_size: int,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+):
+    query = _apply_product_filters(
+        select(
+            Product.id,
+            Product.name,
+            Product.description,
+            Product.price,
+            Product.stock,
+            Product.category_id,
+            Product.image_url,
+            Product.image_key,
+            Product.created_at,
+            Product.updated_at,
+        ),
+        category_id,
+        min_price,
+        max_price,
+        search,
+    ).order_by(Product.created_at.desc(), Product.id.desc())
+    return await db.stream(query.execution_options(yield_per=batch_size))
+
+
+# RANKED FULL-TEXT SEARCH (Only active)
+async def search_products(
+    db: AsyncSession,
+    q: str,
+    limit: int = 10,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+):
+    ts_query = func.websearch_to_tsquery("english", q)
+    # Full-text rank plus trigram similarity so misspelled names still match
+    score = func.ts_rank(Product.search_vector, ts_query) + func.word_similarity(
+        q, Product.name
+    )
+    matches = (
+        _apply_product_filters(
+            select(Product.id, score.label("rank")), category_id, min_price, max_price
+        )
+        .where(
+            or_(
+                Product.search_vector.op("@@")(ts_query),
+                literal(q).op("<%")(Product.name),
+            )
+        )
+        .order_by(score.desc())
+        .limit(limit)
+        .subquery()
+    )
+
+    # Headlines are costly, so only build them for the returned page
+    snippet = func.ts_headline(
+        "english",
+        func.concat_ws(" - ", Product.name, Product.description),
+        ts_query,
+        "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=10",
+    )
+    result = await db.execute(
+        select(Product, matches.c.rank, snippet)
+        .join(matches, Product.id == matches.c.id)
+        .order_by(matches.c.rank.desc())
+    )
+
+    products = []
+    for product, rank, headline in result.all():
+        product.rank = rank
+        product.snippet = headline
+        products.append(product)
+    return products
+
+
+# FACET COUNTS (Only active): one aggregate pass via GROUPING SETS
+async def get_product_facets(
+    db: AsyncSession,
+    category_id: UUID = None,
+    min_price: float = None,
+    max_price: float = None,
+    search: str = None,
+    price_bucket_size: float = 100,
+):
+    bucket = func.floor(Product.price / price_bucket_size)
+    in_stock = func.coalesce(Product.stock, 0) > 0
+    query = (
+        select(
+            Product.category_id,
+            Category.name,
+            bucket.label("bucket"),
+            in_stock.label("in_stock"),
+            func.count().label("count"),
+            func.grouping(Product.category_id).label("by_category"),
+            func.grouping(bucket).label("by_bucket"),
+            func.grouping(in_stock).label("by_stock"),
+        )
+        .select_from(Product)
+        .join(Category, Category.id == Product.category_id)
+        .group_by(
+            func.grouping_sets(
+                tuple_(Product.category_id, Category.name),
+                tuple_(bucket),
+                tuple_(in_stock),
+                tuple_(),
+            )
+        )
+    )
+    query = _apply_product_filters(query, category_id, min_price, max_price, search)
+    result = await db.execute(query)
+
+    facets = {"total": 0, "categories": [], "price_histogram": [], "in_stock": 0}
+    for row in result.all():
+        if row.by_category == 0:
+            facets["categories"].append(
+                {"category_id": row.category_id, "name": row.name, "count": row.count}
+            )
+        elif row.by_bucket == 0:
+            low = float(row.bucket) * price_bucket_size
+            facets["price_histogram"].append(
+                {"min": low, "max": low + price_bucket_size, "count": row.count}
+            )
+        elif row.by_stock == 0:
+            if row.in_stock:
+                facets["in_stock"] = row.count
+        else:
+            facets["total"] = row.count
+
+    facets["out_of_stock"] = facets["total"] - facets["in_stock"]
+    facets["categories"].sort(key=lambda c: c["count"], reverse=True)
+    facets["price_histogram"].sort(key=lambda b: b["min"])
+    return facets
+
+
 # GET SINGLE PRODUCT (Only active)
 async def get_product(db: AsyncSession, id: UUID):
     result = await db.execute(
@@ -47,20 +274,48 @@ async def get_product(db: AsyncSession, id: UUID):
     return result.scalar_one_or_none()
 
 
+async def get_product_metadata(db: AsyncSession, id: UUID):
+    result = await db.execute(
+        select(Product.id, Product.updated_at).where(
+            Product.id == id, Product.is_active
+        )
+    )
+    return result.one_or_none()
+
+
+DUPLICATE_NAME = "A product with this name already exists in this category."
+
+
+# Names are unique per category (uq_products_name_category_id)
+def _is_duplicate_name(error: IntegrityError) -> bool:
+    return "uq_products_name_category_id" in str(error.orig)
+
+
+async def _commit_product(db: AsyncSession):
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not _is_duplicate_name(e):
+            raise
+        raise HTTPException(status_code=400, detail=DUPLICATE_NAME)
+
+
 # CREATE PRODUCT
 async def create_product(
-    db: AsyncSession, data: schema.ProductCreate, image_url: str = None
+    db: AsyncSession, data: schema.ProductCreate, image_key: str = None
 ):
-    product = Product(**data.dict(), image_url=image_url, is_active=True)
+    product = Product(**data.dict(), image_key=image_key, is_active=True)
     db.add(product)
-    await db.commit()
+    await _commit_product(db)
+    await bump_catalog_version()
     await db.refresh(product)
     return product
 
 
 # UPDATE PRODUCT
 async def update_product(
-    db: AsyncSession, id: UUID, data: schema.ProductUpdate, image_url: str = None
+    db: AsyncSession, id: UUID, data: schema.ProductUpdate, image_key: str = None
 ):
     result = await db.execute(select(Product).where(Product.id == id))
     product = result.scalar_one_or_none()
@@ -71,10 +326,12 @@ async def update_product(
     for key, value in data.dict(exclude_unset=True).items():
         setattr(product, key, value)
 
-    if image_url:
-        product.image_url = image_url
+    if image_key:
+        product.image_key = image_key
+        product.image_variants = None  # Rebuilt in the background
 
-    await db.commit()
+    await _commit_product(db)
+    await bump_catalog_version()
     await db.refresh(product)
     return product
 
@@ -89,5 +346,157 @@ async def delete_product(db: AsyncSession, product_id: UUID):
 
     product.is_active = False
     await db.commit()
+    await bump_catalog_version()
     await db.refresh(product)
     return {"detail": "Product deleted"}
+
+
+# BATCH CREATE / UPDATE / SOFT DELETE
+# Three queries load every referenced category, every referenced product and
+# the active names the batch could collide with. Operations are then checked
+# in request order against that state, so a delete frees its name for a later
+# create and a name conflict fails only its own item. Consecutive operations
+# of one kind run as a single statement, still in request order, and the
+# whole batch commits once.
+async def apply_product_batch(
+    db: AsyncSession, operations: List[schema.BatchOperation]
+) -> List[dict]:
+    category_ids = {op.category_id for op in operations if op.op != "delete"}
+    category_ids.discard(None)
+    product_ids = {op.id for op in operations if op.op != "create"}
+
+    result = await db.execute(select(Category.id).where(Category.id.in_(category_ids)))
+    valid_categories = set(result.scalars())
+    result = await db.execute(
+        select(Product.id, Product.name, Product.category_id).where(
+            Product.id.in_(product_ids), Product.is_active
+        )
+    )
+    # id -> (name, category_id) of each active product the batch touches
+    products = {row.id: (row.name, row.category_id) for row in result}
+    # (name, category_id) -> id of the active product holding that name
+    holders = await _name_holders(db, operations, products)
+
+    now = datetime.now(timezone.utc)
+    results, runs = [], []
+    for index, op in enumerate(operations):
+        item = {"index": index, "op": op.op}
+        results.append(item)
+        if op.op != "create" and op.id not in products:
+            item.update(status="error", id=op.id, error="Product not found")
+            continue
+        if op.op != "delete" and op.category_id not in valid_categories | {None}:
+            item.update(status="error", error="Category ID is not valid")
+            continue
+
+        if op.op == "create":
+            name = (op.name, op.category_id)
+            if name in holders:
+                item.update(status="error", error=DUPLICATE_NAME)
+                continue
+            # Ids are assigned here so inserted rows map back to their items
+            item.update(status="created", id=uuid4())
+            holders[name] = item["id"]
+            row = {
+                **op.model_dump(exclude={"op"}),
+                "id": item["id"],
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+        elif op.op == "update":
+            values = op.model_dump(exclude_unset=True, exclude={"op"})
+            current = products[op.id]
+            name = (
+                values.get("name", current[0]),
+                values.get("category_id", current[1]),
+            )
+            if holders.get(name, op.id) != op.id:
+                item.update(status="error", id=op.id, error=DUPLICATE_NAME)
+                continue
+            item.update(status="updated", id=op.id)
+            del holders[current]
+            products[op.id] = name
+            holders[name] = op.id
+            row = {**values, "updated_at": now}
+        else:
+            item.update(status="deleted", id=op.id)
+            del holders[products.pop(op.id)]
+            row = op.id
+
+        if runs and runs[-1][0] == op.op:
+            runs[-1][1].append((item, row))
+        else:
+            runs.append((op.op, [(item, row)]))
+
+    for kind, run in runs:
+        if kind == "create":
+            await _insert_batch_products(db, run)
+        elif kind == "update":
+            await _update_batch_products(db, run)
+        else:
+            await db.execute(
+                update(Product)
+                .where(Product.id.in_([id for _, id in run]))
+                .values(is_active=False, updated_at=now)
+            )
+
+    await _commit_product(db)
+    if runs:
+        await bump_catalog_version()
+    return results
+
+
+# Active products holding any (name, category_id) the batch could end up with
+async def _name_holders(db: AsyncSession, operations, products: dict) -> dict:
+    names = {name for name, _ in products.values()}
+    category_ids = {category_id for _, category_id in products.values()}
+    for op in operations:
+        if op.op != "delete":
+            names.add(op.name)
+            category_ids.add(op.category_id)
+    result = await db.execute(
+        select(Product.id, Product.name, Product.category_id).where(
+            Product.name.in_(names - {None}),
+            Product.category_id.in_(category_ids - {None}),
+            Product.is_active,
+        )
+    )
+    return {(row.name, row.category_id): row.id for row in result}
+
+
+async def _insert_batch_products(db: AsyncSession, run: List[tuple]):
+    stmt = (
+        insert(Product)
+        # A concurrent writer can still take a name after it was checked
+        .on_conflict_do_nothing(
+            index_elements=["name", "category_id"], index_where=Product.is_active
+        ).returning(Product.id)
+        # Keep NULLs so rows with different empty columns share one batch
+        .execution_options(render_nulls=True)
+    )
+    inserted = set((await db.execute(stmt, [row for _, row in run])).scalars())
+    for item, row in run:
+        if row["id"] not in inserted:
+            item.update(status="error", id=None, error=DUPLICATE_NAME)
+
+
+# Bulk UPDATE by primary key, executed as one executemany. If a concurrent
+# writer took one of the names meanwhile, the run is retried item by item so
+# only that item fails.
+async def _update_batch_products(db: AsyncSession, run: List[tuple]):
+    try:
+        async with db.begin_nested():
+            await db.execute(update(Product), [row for _, row in run])
+        return
+    except IntegrityError as e:
+        if not _is_duplicate_name(e):
+            raise
+    for item, row in run:
+        try:
+            async with db.begin_nested():
+                await db.execute(update(Product), [row])
+        except IntegrityError as e:
+            if not _is_duplicate_name(e):
+                raise
+            item.update(status="error", error=DUPLICATE_NAME)
@@ -1,15 +1,33 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 from fastapi import Form
+from ....core.config import settings
+
+# Variant shown in list views; WebP is a fraction of the original's size
+LIST_VARIANT = ("thumbnail", "webp")
+
+
+# `urls` maps object keys to URLs already signed by s3_service.presign_urls
+def sign_variants(variants: Optional[dict], urls: Dict[str, str]):
+    if not variants:
+        return None
+    return {
+        name: {ext: urls[key] for ext, key in formats.items()}
+        for name, formats in variants.items()
+    }
+
+
+# Same bounds as the products.price column, Numeric(10, 2)
+PRICE_DIGITS = {"max_digits": 10, "decimal_places": 2}
 
 
 class ProductCreate(BaseModel):
     name: str = Field(..., min_length=3, max_length=100)
     description: Optional[str] = None
-    price: Decimal = Field(..., gt=0)
+    price: Decimal = Field(..., gt=0, **PRICE_DIGITS)
     stock: Optional[int] = Field(default=0, ge=0)
     category_id: UUID
 
@@ -34,7 +52,7 @@ class ProductCreate(BaseModel):
 class ProductUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=3, max_length=100)
     description: Optional[str] = None
-    price: Optional[Decimal] = Field(None, gt=0)
+    price: Optional[Decimal] = Field(None, gt=0, **PRICE_DIGITS)
     stock: Optional[int] = Field(None, ge=0)
     category_id: Optional[UUID]
 
@@ -64,8 +82,108 @@ class ProductOut(BaseModel):
     stock: int
     category_id: UUID
     image_url: Optional[str]
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
+    thumbnail_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+# ProductOut's JSON shape built straight from trusted rows, without validation.
+# Image URLs come from `urls` (see sign_variants).
+def serialize_product(product, urls: Dict[str, str]) -> dict:
+    image_url = urls[product.image_key] if product.image_key else product.image_url
+    variants = sign_variants(product.image_variants, urls)
+    name, ext = LIST_VARIANT
+    return {
+        "id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+        "stock": product.stock,
+        "category_id": product.category_id,
+        "image_url": image_url,
+        "image_variants": variants,
+        "thumbnail_url": variants[name][ext] if variants else None,
+        "created_at": product.created_at,
+        "updated_at": product.updated_at,
+    }
+
+
+class ProductPage(BaseModel):
+    items: List[ProductOut]
+    next_cursor: Optional[str]
+
+
+class ProductSearchHit(ProductOut):
+    rank: float
+    snippet: Optional[str]
+
+
+class CategoryFacet(BaseModel):
+    category_id: UUID
+    name: str
+    count: int
+
+
+class PriceBucket(BaseModel):
+    min: float
+    max: float
+    count: int
+
+
+class ProductFacets(BaseModel):
+    total: int
+    categories: List[CategoryFacet]
+    price_histogram: List[PriceBucket]
+    in_stock: int
+    out_of_stock: int
+
+
+class BatchCreate(ProductCreate):
+    op: Literal["create"]
+
+
+class BatchUpdate(ProductUpdate):
+    op: Literal["update"]
+    id: UUID
+    category_id: Optional[UUID] = None
+
+    # Omitted fields stay unchanged, but these columns can't be set to NULL
+    @model_validator(mode="after")
+    def reject_nulls(self):
+        for field in ("name", "price", "category_id"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+BatchOperation = Annotated[
+    Union[BatchCreate, BatchUpdate, BatchDelete], Field(discriminator="op")
+]
+
+
+class ProductBatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(
+        ..., min_length=1, max_length=settings.PRODUCT_BATCH_MAX_SIZE
+    )
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: str
+    # created | updated | deleted | error
+    status: str
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class ProductBatchResponse(BaseModel):
+    results: List[BatchItemResult]
@@ -0,0 +1,37 @@
+from cachetools import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_collector
+from .schema import UserResponse
+
+# user_id -> UserResponse snapshot, bounded by size (LRU) and age (TTL)
+_users = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def get_cached_user(user_id):
+    user = _users.get(str(user_id))
+    if user is None:
+        _stats["misses"] += 1
+    else:
+        _stats["hits"] += 1
+    return user
+
+
+def cache_user(user) -> UserResponse:
+    snapshot = UserResponse.model_validate(user)
+    _users[str(snapshot.id)] = snapshot
+    return snapshot
+
+
+def invalidate_user(user_id):
+    if _users.pop(str(user_id), None) is not None:
+        _stats["invalidations"] += 1
+
+
+def get_user_cache_stats() -> dict:
+    return {**_stats, "size": len(_users), "max_size": _users.maxsize}
+
+
+register_collector("user_cache", get_user_cache_stats)
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from . import repository, schema
-from .service import get_db, get_current_user
+from .service import get_db, get_current_user, with_profile_urls
 
 router = APIRouter(tags=["User_Information"])
 
 
 @router.get("/user/info", response_model=schema.UserResponse)
 async def get_user_info(current_user=Depends(get_current_user)):
-    return current_user
+    return await with_profile_urls(current_user)
 
 
 @router.patch("/user/update", response_model=schema.UserResponse)
@@ -18,7 +18,7 @@ async def update_user_info(
     current_user=Depends(get_current_user),
 ):
     updated_user = await repository.update_user(db, current_user.id, data)
-    return updated_user
+    return await with_profile_urls(schema.UserResponse.model_validate(updated_user))
 
 
 @router.delete("/user/delete")
@@ -2,14 +2,18 @@ from sqlalchemy import Column, String, Boolean, DateTime
 from ....db.base import Base
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 
 class User(Base):
     __tablename__ = "users"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String, nullable=False)
+    # External picture URL (e.g. from Google)
     profile_picture = Column(String)
+    # Object key in the profile-info bucket; signed when read
+    profile_picture_key = Column(String)
+    profile_picture_variants = Column(JSONB)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String, nullable=False)
     auth_provider = Column(String, default="Manual")
@@ -5,6 +5,8 @@ from typing import Optional
 from fastapi import UploadFile
 from .schema import UpdateUserRequest
 from ....services.s3_service import save_profile_info
+from .cache import invalidate_user
+from ....services.image_variants import schedule_profile_variants
 
 
 async def update_user(
@@ -23,11 +25,14 @@ async def update_user(
         user.name = name
 
     if profile_picture:
-        profile_picture_url = await save_profile_info(profile_picture)
-        user.profile_picture = profile_picture_url
+        user.profile_picture_key = await save_profile_info(profile_picture)
+        user.profile_picture_variants = None  # Rebuilt in the background
 
     await db.commit()
+    invalidate_user(user_id)
     await db.refresh(user)
+    if profile_picture:
+        schedule_profile_variants(user.id, user.profile_picture_key)
     return user
 
 
@@ -37,6 +42,7 @@ async def delete_user(db: AsyncSession, user_id: int):
     if user:
         await db.delete(user)
         await db.commit()
+        invalidate_user(user_id)
 
 
 async def get_user_by_id(db: AsyncSession, user_id: int):
@@ -50,5 +56,6 @@ async def update_user_in_db(user: User, data: UpdateUserRequest, db: AsyncSessio
 
     db.add(user)
     await db.commit()
+    invalidate_user(user.id)
     await db.refresh(user)
     return user
@@ -1,6 +1,6 @@
 # schema.py
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, List, Optional
 from uuid import UUID as uuid
 from fastapi import UploadFile
 
@@ -10,11 +10,31 @@ class UserResponse(BaseModel):
     name: str
     email: EmailStr
     profile_picture: Optional[str]
+    profile_picture_key: Optional[str] = Field(default=None, exclude=True)
+    profile_picture_variants: Optional[Dict[str, Dict[str, str]]] = Field(
+        default=None, exclude=True
+    )
+    profile_picture_thumbnail_url: Optional[str] = None
     is_verified: bool
 
     class Config:
         from_attributes = True
 
+    def _thumbnail_key(self) -> Optional[str]:
+        if self.profile_picture_variants:
+            return self.profile_picture_variants["thumbnail"]["webp"]
+        return None
+
+    def image_keys(self) -> List[Optional[str]]:
+        return [self.profile_picture_key, self._thumbnail_key()]
+
+    # `urls` maps image_keys() to URLs signed by s3_service.presign_urls
+    def with_signed_urls(self, urls: Dict[str, str]) -> "UserResponse":
+        update = {"profile_picture_thumbnail_url": urls.get(self._thumbnail_key())}
+        if self.profile_picture_key:
+            update["profile_picture"] = urls[self.profile_picture_key]
+        return self.model_copy(update=update)
+
 
 class UpdateUserRequest(BaseModel):
     name: Optional[str]
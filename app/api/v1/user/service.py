@@ -1,17 +1,18 @@
 from fastapi import Depends, HTTPException, status, Request
-from jose import JWTError, jwt
-from app.core.config import settings
+from jose import JWTError
+from app.core.token_verifier import verify_token
 from app.db.session import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from .model import User
 from .repository import update_user_in_db, get_user_by_id
+from .cache import get_cached_user, cache_user
+from .schema import UserResponse
+from app.services.s3_service import presign_urls, PROFILE_BUCKET
 
 
 def verify_jwt_token(token: str) -> int:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = verify_token(token)
         user_id: int = payload.get("user_id")
         if user_id is None:
             raise HTTPException(
@@ -26,7 +27,7 @@ def verify_jwt_token(token: str) -> int:
 
 async def get_current_user(
     request: Request, db: AsyncSession = Depends(get_db)
-) -> User:
+) -> UserResponse:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(
@@ -34,18 +35,27 @@ async def get_current_user(
         )
 
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = verify_token(token)
         user_id = payload.get("user_id")
     except (JWTError, TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    cached = get_cached_user(user_id)
+    if cached:
+        return cached
+
     user = await get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    return cache_user(user)
+
+
+# Signs profile picture URLs off the event loop. Cached users hold only object
+# keys, so a cache hit never serves an expired link.
+async def with_profile_urls(user: UserResponse) -> UserResponse:
+    urls = await presign_urls(PROFILE_BUCKET, user.image_keys())
+    return user.with_signed_urls(urls)
 
 
 def get_user_profile(user: User):
@@ -0,0 +1,78 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+from fastapi import Request, Response
+
+
+# ETag over (id, updated_at) pairs; `variant` separates response shapes built
+# from the same rows. Weak when equal rows can render to different bytes.
+def rows_etag(
+    rows: Iterable[Tuple[object, Optional[datetime]]],
+    variant: str = "",
+    weak: bool = False,
+) -> str:
+    digest = hashlib.sha256(variant.encode())
+    for id, updated_at in rows:
+        stamp = updated_at.timestamp() if updated_at else ""
+        digest.update(f"|{id}:{stamp}".encode())
+    etag = f'"{digest.hexdigest()[:32]}"'
+    return f"W/{etag}" if weak else etag
+
+
+# ETag and Last-Modified for a single row. Lists only get an ETag: their newest
+# updated_at misses deleted rows and rows shifting between pages.
+def row_validators(
+    id: object, updated_at: Optional[datetime]
+) -> Tuple[str, Optional[datetime]]:
+    return rows_etag([(id, updated_at)]), updated_at
+
+
+# Routes that don't send Last-Modified can never answer If-Modified-Since
+# with a 304, so only If-None-Match is worth the metadata query there
+def has_conditional_headers(request: Request, last_modified: bool = False) -> bool:
+    if "if-none-match" in request.headers:
+        return True
+    return last_modified and "if-modified-since" in request.headers
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent. It uses the
+    # weak comparison, so W/"x" and "x" match.
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [_opaque_tag(tag.strip()) for tag in if_none_match.split(",")]
+        return "*" in tags or _opaque_tag(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> Response:
+    response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return set_validators(Response(status_code=304), etag, last_modified)
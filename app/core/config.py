@@ -11,14 +11,100 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "supersecretkey"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # bcrypt runs in a dedicated thread pool; this caps concurrent hashes
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Token-bucket limits (requests per minute) for the expensive auth routes,
+    # plus a cap on concurrent bcrypt-bearing requests beyond which we shed load
+    AUTH_RATE_LIMIT_PER_IP: int = 30
+    AUTH_RATE_LIMIT_PER_EMAIL: int = 5
+    AUTH_MAX_CONCURRENT_HASHING: int = 32
+
+    # In-process cache of authenticated users looked up by get_current_user
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    OTP_EXPIRE_MINUTES: int = 10
+    OTP_PURGE_INTERVAL_SECONDS: int = 300
+    OTP_PURGE_BATCH_SIZE: int = 1000
+
+    # OTP emails go through an in-process outbox; "mock" or "sendgrid"
+    EMAIL_TRANSPORT: str = "mock"
+    EMAIL_QUEUE_WORKERS: int = 2
+    EMAIL_QUEUE_MAX_SIZE: int = 10000
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_MAX_RETRIES: int = 3
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 0.5
+    EMAIL_QUEUE_DRAIN_TIMEOUT_SECONDS: float = 5
+
+    # Bearer token for GET /metrics; the endpoint is disabled while unset
+    METRICS_TOKEN: str = ""
+
+    # Shared outbound HTTP client
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30
+    HTTP_CONNECT_TIMEOUT: float = 3
+    HTTP_READ_TIMEOUT: float = 10
+    HTTP_POOL_TIMEOUT: float = 5
 
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
     DATABASE_CONNECTION: str
     IS_DEVELOPMENT: bool = IS_DEVELOPMENT
 
-    MAX_FILE_SIZE_MB: int = 5
+    # Above one part, so larger images take the multipart path
+    MAX_FILE_SIZE_MB: int = 20
+    # Uploads larger than one part go to S3 as a concurrent multipart upload
+    # (S3 requires parts of at least 5 MB)
+    S3_MULTIPART_PART_SIZE_MB: int = 5
+    S3_MULTIPART_CONCURRENCY: int = 4
+    # Sizes both botocore's connection pool and the S3 worker threads
+    S3_MAX_POOL_CONNECTIONS: int = 10
+    # Image URLs are signed at read time and cached until close to expiry
+    PRESIGNED_URL_EXPIRES_SECONDS: int = 3600
+    PRESIGNED_URL_REFRESH_MARGIN_SECONDS: int = 300
+    PRESIGNED_URL_CACHE_SIZE: int = 50000
+    # Content hashes known to be in S3, checked before a HEAD request
+    KNOWN_OBJECT_CACHE_SIZE: int = 100000
+
+    # Rows parsed, inserted and committed per chunk by CSV import jobs
+    CSV_IMPORT_BATCH_SIZE: int = 1000
+    # How often the import worker looks for jobs when not woken by an upload
+    IMPORT_POLL_INTERVAL_SECONDS: int = 5
+    # A job whose lease isn't renewed for this long is resumed by any worker
+    IMPORT_LEASE_SECONDS: int = 120
+    # Row errors kept on a job; error_count keeps counting past this
+    IMPORT_MAX_ERRORS: int = 1000
+    # Claims of a job before an unexpected error marks it failed for good
+    IMPORT_MAX_ATTEMPTS: int = 3
+
+    # Operations accepted by one POST /products/batch call
+    PRODUCT_BATCH_MAX_SIZE: int = 1000
+
+    # Rows fetched per server-side cursor round-trip by GET /products/export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Read-through cache for catalog reads; "memory" (per worker), "redis", or
+    # empty for redis when more than one worker runs and memory otherwise
+    CATALOG_CACHE_BACKEND: str = ""
+    CATALOG_CACHE_URL: str = "redis://localhost:6379/0"
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    CATALOG_CACHE_MAX_SIZE: int = 10000
+    # Redis calls give up after this; the read then goes to the database
+    CATALOG_CACHE_TIMEOUT_SECONDS: float = 0.25
+    # A worker's memory cache misses writes made through other workers, so
+    # with several workers its entries expire after this instead
+    CATALOG_CACHE_LOCAL_TTL_SECONDS: int = 10
+    # Worker processes per host; uvicorn --workers defaults to the same variable
+    WEB_CONCURRENCY: int = 1
+    # Processes rendering thumbnail/medium image variants
+    IMAGE_VARIANT_WORKERS: int = 2
     REGION: str
     aws_access_key_id: str
     aws_secret_access_key: str
@@ -28,4 +114,4 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
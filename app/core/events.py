@@ -0,0 +1,18 @@
+import asyncio
+import logging
+from .config import settings
+from ..db.session import AsyncSessionLocal
+from ..api.v1.auth.repository import purge_expired_otps
+
+
+async def purge_expired_otps_periodically():
+    batch_size = settings.OTP_PURGE_BATCH_SIZE
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                # Delete in bounded batches so one sweep never holds a long lock
+                while await purge_expired_otps(db, batch_size) >= batch_size:
+                    pass
+        except Exception as e:
+            logging.error(f"OTP purge failed: {e}", exc_info=True)
+        await asyncio.sleep(settings.OTP_PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Optional
+import httpx
+from .config import settings
+from .metrics import register_collector
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class PooledAsyncClient(httpx.AsyncClient):
+    # httpx only caps connections globally; this adds a per-host cap so one
+    # slow upstream can't take every socket in the pool.
+    def __init__(self, max_connections_per_host: int, **kwargs):
+        super().__init__(**kwargs)
+        self._host_slots = defaultdict(
+            lambda: asyncio.Semaphore(max_connections_per_host)
+        )
+        self.host_stats = defaultdict(
+            lambda: {
+                "requests": 0,
+                "errors": 0,
+                "in_flight": 0,
+                "slot_timeouts": 0,
+                "total_latency_ms": 0.0,
+                "max_latency_ms": 0.0,
+            }
+        )
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        host = request.url.host
+        stats = self.host_stats[host]
+        slots = self._host_slots[host]
+        try:
+            await asyncio.wait_for(slots.acquire(), settings.HTTP_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            stats["slot_timeouts"] += 1
+            raise httpx.PoolTimeout(f"Too many in-flight requests to {host}")
+
+        stats["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            return await super().send(request, **kwargs)
+        except httpx.HTTPError:
+            stats["errors"] += 1
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            stats["requests"] += 1
+            stats["in_flight"] -= 1
+            stats["total_latency_ms"] += latency_ms
+            stats["max_latency_ms"] = max(stats["max_latency_ms"], latency_ms)
+            slots.release()
+
+
+_client: Optional[PooledAsyncClient] = None
+
+
+async def start_http_client():
+    global _client
+    _client = PooledAsyncClient(
+        max_connections_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_READ_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+    )
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    if _client is None:
+        raise RuntimeError("HTTP client is not started")
+    return _client
+
+
+def get_http_client_stats() -> dict:
+    if _client is None:
+        return {}
+    hosts = {}
+    for host, stats in _client.host_stats.items():
+        avg = stats["total_latency_ms"] / stats["requests"] if stats["requests"] else 0
+        hosts[host] = {**stats, "avg_latency_ms": round(avg, 2)}
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        "max_connections_per_host": settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        "hosts": hosts,
+    }
+
+
+register_collector("http_client", get_http_client_stats)
@@ -0,0 +1,28 @@
+import secrets
+from typing import Callable, Dict
+from fastapi import HTTPException, Request, status
+from .config import settings
+
+# name -> zero-arg callable returning a dict of current stats
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict]):
+    _collectors[name] = collector
+
+
+def snapshot() -> dict:
+    return {name: collector() for name, collector in _collectors.items()}
+
+
+# Metrics expose worker ids and internal load, so they are for operators only
+async def require_metrics_token(request: Request):
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
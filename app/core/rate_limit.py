@@ -0,0 +1,103 @@
+import asyncio
+import math
+import time
+from collections import Counter
+from typing import Protocol
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, status
+from .config import settings
+from .metrics import register_collector
+
+
+class RateLimitBackend(Protocol):
+    # Takes one token from the bucket at `key`. Returns 0 when allowed,
+    # otherwise the number of seconds until a token becomes available.
+    async def acquire(self, key: str, rate: float, capacity: int) -> float: ...
+
+
+class InMemoryRateLimitBackend:
+    def __init__(self, max_keys: int = 100_000, idle_ttl: int = 3600):
+        # key -> (tokens, last_refill); idle buckets age out
+        self._buckets = TTLCache(maxsize=max_keys, ttl=idle_ttl)
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+
+# Swap for a shared store (e.g. Redis) to enforce limits across workers
+_backend: RateLimitBackend = InMemoryRateLimitBackend()
+_rejected = Counter()
+_hashing_in_flight = 0
+
+# Caps requests that are doing bcrypt work at any one time
+_bcrypt_slots = asyncio.Semaphore(settings.AUTH_MAX_CONCURRENT_HASHING)
+
+
+def set_rate_limit_backend(backend: RateLimitBackend):
+    global _backend
+    _backend = backend
+
+
+def _too_many_requests(scope: str, retry_after: float):
+    _rejected[scope] += 1
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests. Please try again later.",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def enforce_rate_limit(scope: str, identity: str, per_minute: int):
+    retry_after = await _backend.acquire(
+        f"{scope}:{identity}", per_minute / 60, per_minute
+    )
+    if retry_after:
+        _too_many_requests(scope, retry_after)
+
+
+def limit_by_ip(scope: str):
+    async def dependency(request: Request):
+        client_ip = request.client.host if request.client else "unknown"
+        await enforce_rate_limit(
+            f"{scope}:ip", client_ip, settings.AUTH_RATE_LIMIT_PER_IP
+        )
+
+    return dependency
+
+
+async def limit_by_email(scope: str, email: str):
+    await enforce_rate_limit(
+        f"{scope}:email", email.lower(), settings.AUTH_RATE_LIMIT_PER_EMAIL
+    )
+
+
+# Sheds load instead of queueing when every hashing slot is busy
+async def bcrypt_admission():
+    global _hashing_in_flight
+    if _bcrypt_slots.locked():
+        _too_many_requests("bcrypt_admission", 1)
+    await _bcrypt_slots.acquire()
+    _hashing_in_flight += 1
+    try:
+        yield
+    finally:
+        _hashing_in_flight -= 1
+        _bcrypt_slots.release()
+
+
+def get_rate_limit_stats() -> dict:
+    return {
+        "rejected": dict(_rejected),
+        "hashing_in_flight": _hashing_in_flight,
+        "max_concurrent_hashing": settings.AUTH_MAX_CONCURRENT_HASHING,
+    }
+
+
+register_collector("rate_limit", get_rate_limit_stats)
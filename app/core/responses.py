@@ -0,0 +1,26 @@
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def orjson_default(value):
+    # Same string form Pydantic uses for Decimal in JSON mode
+    if isinstance(value, Decimal):
+        return str(value)
+    # asyncpg's UUID subclass, which orjson only encodes as exact uuid.UUID
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+# orjson encodes uuid.UUID and datetime natively. Handlers return this directly
+# with plain dicts, which skips response_model validation
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
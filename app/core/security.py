@@ -1,11 +1,23 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from .config import settings
+from .metrics import register_collector
+from .token_verifier import verify_token
+import asyncio
 import re
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small dedicated thread pool keeps hashing off
+# the event loop without competing with the default executor.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+_hash_stats = {"queued": 0, "max_queued": 0, "in_flight": 0, "completed": 0}
+
 
 def verify_password(plain, hashed):
     return pwd_context.verify(plain, hashed)
@@ -15,6 +27,43 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+async def _run_in_hash_pool(func, *args):
+    _hash_stats["queued"] += 1
+    _hash_stats["max_queued"] = max(_hash_stats["max_queued"], _hash_stats["queued"])
+    try:
+        await _hash_slots.acquire()
+    finally:
+        _hash_stats["queued"] -= 1
+
+    _hash_stats["in_flight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_stats["in_flight"] -= 1
+        _hash_stats["completed"] += 1
+        _hash_slots.release()
+
+
+async def verify_password_async(plain, hashed):
+    return await _run_in_hash_pool(verify_password, plain, hashed)
+
+
+async def hash_password_async(password):
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def shutdown_hash_executor():
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_password_pool_stats() -> dict:
+    return {**_hash_stats, "workers": settings.PASSWORD_HASH_WORKERS}
+
+
+register_collector("password_hashing", get_password_pool_stats)
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta is None:
@@ -26,9 +75,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
 
 def decode_token(token: str):
     try:
-        return jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        return verify_token(token)
     except JWTError:
         return None
 
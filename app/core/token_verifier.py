@@ -0,0 +1,40 @@
+import hashlib
+import time
+from cachetools import TLRUCache
+from jose import jwt
+from .config import settings
+from .metrics import register_collector
+
+
+def _expires_at(_key, claims, now):
+    exp = claims.get("exp")
+    if exp is None:
+        return now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return exp
+
+
+# sha256(token) -> verified claims; each entry lives until the token's exp
+_verified = TLRUCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttu=_expires_at, timer=time.time
+)
+_stats = {"hits": 0, "misses": 0}
+
+
+def verify_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _verified.get(key)
+    if claims is not None:
+        _stats["hits"] += 1
+        return dict(claims)
+
+    _stats["misses"] += 1
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    _verified[key] = claims
+    return dict(claims)
+
+
+def get_token_cache_stats() -> dict:
+    return {**_stats, "size": len(_verified), "max_size": _verified.maxsize}
+
+
+register_collector("token_cache", get_token_cache_stats)
@@ -0,0 +1,55 @@
+import logging
+from pathlib import Path
+from typing import Optional
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from alembic.script.revision import ResolutionError
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from .session import async_engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+# Read from the local migration scripts; no database access needed
+def _script_directory() -> ScriptDirectory:
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return ScriptDirectory.from_config(config)
+
+
+def get_head_revision() -> str:
+    return _script_directory().get_current_head()
+
+
+# At or past this code's head. A revision the local scripts don't know was
+# written by a newer release, e.g. mid rolling deploy after it migrated.
+def is_schema_compatible(current: Optional[str]) -> bool:
+    if current is None:
+        return False
+    script = _script_directory()
+    head = script.get_current_head()
+    if current == head:
+        return True
+    try:
+        ancestors = {rev.revision for rev in script.iterate_revisions(current, "base")}
+    except ResolutionError:
+        logging.warning(f"Database is at unknown revision {current}; assuming newer")
+        return True
+    return head in ancestors
+
+
+# A single query at startup instead of reflecting the whole schema per worker
+async def ensure_schema_is_current():
+    async with async_engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = result.scalar()
+        except DBAPIError:
+            current = None
+
+    if not is_schema_compatible(current):
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {get_head_revision()}"
+            " or later. Run `alembic upgrade head` before starting the app."
+        )
@@ -1,21 +1,43 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from .api.v1.auth.endpoints import router as auth_router
 from .api.v1.user.endpoints import router as user_router
 from .api.v1.category.endpoints import router as category_router
 from .api.v1.product.endpoints import router as product_router
-from .db.base import Base
-from .db.session import async_engine
+from .api.v1.imports.endpoints import router as import_router
+from .db.schema_check import ensure_schema_is_current
+from .core import metrics
+from .core.security import shutdown_hash_executor
+from .core.events import purge_expired_otps_periodically
+from .services.email_queue import start_email_queue, stop_email_queue
+from .services.import_worker import start_import_worker, stop_import_worker
+from .core.http_client import start_http_client, close_http_client
+from .services.s3_service import ensure_buckets_exist, shutdown_s3_executor
+from .services.image_variants import shutdown_image_pool
+import asyncio
 import logging
 from fastapi.responses import JSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Migrations are applied out of band with `alembic upgrade head`
+    await ensure_schema_is_current()
+    await ensure_buckets_exist()
+    await start_http_client()
+    await start_email_queue()
+    # Also resumes imports interrupted by the last shutdown
+    await start_import_worker()
+    otp_purge_task = asyncio.create_task(purge_expired_otps_periodically())
     yield  # App runs here
+    otp_purge_task.cancel()
+    await stop_import_worker()
+    await stop_email_queue()
+    await close_http_client()
+    shutdown_image_pool()
+    shutdown_s3_executor()
+    shutdown_hash_executor()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -50,7 +72,13 @@ async def root():
     return {"message": "Project is running"}
 
 
+@app.get("/metrics", dependencies=[Depends(metrics.require_metrics_token)])
+async def get_metrics():
+    return metrics.snapshot()
+
+
 app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(category_router)
 app.include_router(product_router)
+app.include_router(import_router)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Protocol
+from ..core.config import settings
+from ..core.metrics import register_collector
+
+
+@dataclass
+class OtpEmail:
+    email: str
+    otp: str
+
+
+class EmailTransport(Protocol):
+    async def send(self, messages: List[OtpEmail]): ...
+
+    async def aclose(self): ...
+
+
+# Raised by a transport when retrying the same batch cannot succeed
+class PermanentEmailError(Exception):
+    pass
+
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_transport: Optional[EmailTransport] = None
+_stats = {
+    "enqueued": 0,
+    "sent": 0,
+    "failed": 0,
+    "retries": 0,
+    "batches": 0,
+    "splits": 0,
+}
+
+
+def _default_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "sendgrid":
+        from .email_service import SendGridTransport
+
+        return SendGridTransport()
+    from .mock_email_service import MockEmailTransport
+
+    return MockEmailTransport()
+
+
+async def start_email_queue(transport: Optional[EmailTransport] = None):
+    global _queue, _workers, _transport
+    _transport = transport or _default_transport()
+    _queue = asyncio.Queue(maxsize=settings.EMAIL_QUEUE_MAX_SIZE)
+    _workers = [
+        asyncio.create_task(_worker()) for _ in range(settings.EMAIL_QUEUE_WORKERS)
+    ]
+
+
+async def stop_email_queue():
+    # Give queued messages a chance to go out before shutting down
+    try:
+        await asyncio.wait_for(
+            _queue.join(), timeout=settings.EMAIL_QUEUE_DRAIN_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        logging.warning(f"Dropping {_queue.qsize()} queued emails on shutdown")
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    await _transport.aclose()
+
+
+# Waits only when the queue is full, never on the email provider
+async def enqueue_otp_email(email: str, otp: str):
+    await _queue.put(OtpEmail(email=email, otp=otp))
+    _stats["enqueued"] += 1
+
+
+async def _next_batch() -> List[OtpEmail]:
+    batch = [await _queue.get()]
+    while len(batch) < settings.EMAIL_BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+async def _deliver(batch: List[OtpEmail]):
+    for attempt in range(settings.EMAIL_MAX_RETRIES + 1):
+        try:
+            await _transport.send(batch)
+            _stats["sent"] += len(batch)
+            _stats["batches"] += 1
+            return
+        except PermanentEmailError as e:
+            # One bad address rejects the whole request; bisect so only the
+            # rejected recipients are dropped
+            if len(batch) > 1:
+                _stats["splits"] += 1
+                middle = len(batch) // 2
+                await _deliver(batch[:middle])
+                await _deliver(batch[middle:])
+                return
+            logging.error(f"Email to {batch[0].email} rejected: {e}")
+            break
+        except Exception as e:
+            if attempt == settings.EMAIL_MAX_RETRIES:
+                logging.error(f"Email batch failed after retries: {e}")
+                break
+            _stats["retries"] += 1
+            await asyncio.sleep(settings.EMAIL_RETRY_BACKOFF_SECONDS * 2**attempt)
+    _stats["failed"] += len(batch)
+
+
+async def _worker():
+    while True:
+        batch = await _next_batch()
+        try:
+            await _deliver(batch)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def get_email_queue_stats() -> dict:
+    return {**_stats, "queued": _queue.qsize() if _queue else 0}
+
+
+register_collector("email_queue", get_email_queue_stats)
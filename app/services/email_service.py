@@ -1,6 +1,10 @@
+import logging
 import os
-import httpx
+from typing import List
 from dotenv import load_dotenv
+from ..core.config import settings
+from ..core.http_client import get_http_client
+from .email_queue import OtpEmail, PermanentEmailError
 
 load_dotenv(override=True)
 
@@ -9,34 +13,45 @@ SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 
 SENDGRID_API_URL = "https://api.sendgrid.com/v3/mail/send"
 
+# SendGrid replaces this tag with each personalization's own OTP
+OTP_TAG = "-otp-"
 
-async def send_otp_email(email: str, otp: str):
+
+class SendGridTransport:
     headers = {
         "Authorization": f"Bearer {SENDGRID_API_KEY}",
         "Content-Type": "application/json",
     }
 
-    payload = {
-        "personalizations": [
-            {"to": [{"email": email}], "subject": "Your OTP Code for Verification"}
-        ],
-        "from": {"email": SENDER_EMAIL},
-        "content": [
-            {
-                "type": "text/plain",
-                "value": f"Your OTP code is: {otp}. It is valid for 10 minutes.",
-            }
-        ],
-    }
+    async def send(self, messages: List[OtpEmail]):
+        # A whole batch goes out as one multi-personalization request
+        payload = {
+            "personalizations": [
+                {"to": [{"email": m.email}], "substitutions": {OTP_TAG: m.otp}}
+                for m in messages
+            ],
+            "subject": "Your OTP Code for Verification",
+            "from": {"email": SENDER_EMAIL},
+            "content": [
+                {
+                    "type": "text/plain",
+                    "value": f"Your OTP code is: {OTP_TAG}. It is valid for "
+                    f"{settings.OTP_EXPIRE_MINUTES} minutes.",
+                }
+            ],
+        }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                SENDGRID_API_URL, headers=headers, json=payload
-            )
+        # The shared app client keeps the TLS connection to SendGrid alive
+        response = await get_http_client().post(
+            SENDGRID_API_URL, headers=self.headers, json=payload
+        )
+        if response.status_code == 429 or response.status_code >= 500:
             response.raise_for_status()
-            print(f"Email sent to {email}. Status Code: {response.status_code}")
-        except httpx.HTTPStatusError as e:
-            print(f"Failed to send OTP email: {e.response.text}")
-        except Exception as e:
-            print(f"Error sending OTP email: {e}")
+        if response.is_error:
+            raise PermanentEmailError(response.text)
+        logging.info(
+            f"Email batch of {len(messages)} sent. Status Code: {response.status_code}"
+        )
+
+    async def aclose(self):
+        pass  # The shared client is closed by the app lifespan
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, Optional
+from PIL import Image, ImageOps
+from sqlalchemy import update
+from ..core.config import settings
+from ..core.metrics import register_collector
+from ..db.session import AsyncSessionLocal
+from ..api.v1.product.model import Product
+from ..api.v1.user.model import User
+from ..api.v1.user.cache import invalidate_user
+from ..api.v1.product.cache import bump_catalog_version
+from .s3_service import (
+    object_exists,
+    read_object,
+    upload_bytes,
+    PRODUCT_BUCKET,
+    PROFILE_BUCKET,
+)
+
+# Longest edge in pixels for each variant
+VARIANT_SIZES = {"thumbnail": 200, "medium": 800}
+VARIANT_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+# Keep references so in-flight jobs aren't garbage collected
+_jobs = set()
+_stats = {"scheduled": 0, "completed": 0, "failed": 0}
+
+
+# Runs in a worker process: decoding and resizing are CPU bound
+def _render_variants(content: bytes) -> Dict[str, Dict[str, bytes]]:
+    rendered = {}
+    with Image.open(BytesIO(content)) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+    for name, size in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((size, size))
+        rendered[name] = {}
+        for ext, (pil_format, _) in VARIANT_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, format=pil_format, quality=80)
+            rendered[name][ext] = buffer.getvalue()
+    return rendered
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # Spawn, not fork: this process already runs the bcrypt and S3 thread
+        # pools, and a forked child can inherit a lock one of them held
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def shutdown_image_pool():
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _variant_key(key: str, name: str, ext: str) -> str:
+    # Variants are stored alongside the original
+    return f"{key}.{name}.{ext}"
+
+
+async def build_variants(bucket_name: str, key: str) -> Dict[str, Dict[str, str]]:
+    variants = {
+        name: {ext: _variant_key(key, name, ext) for ext in VARIANT_FORMATS}
+        for name in VARIANT_SIZES
+    }
+    # Keys are content-addressed, so a re-uploaded image already has variants
+    if await object_exists(bucket_name, variants["medium"]["jpeg"]):
+        return variants
+
+    content = await read_object(bucket_name, key)
+    loop = asyncio.get_running_loop()
+    rendered = await loop.run_in_executor(
+        _get_process_pool(), _render_variants, content
+    )
+
+    # medium.jpeg is uploaded last: its presence marks a complete set
+    uploads = [
+        upload_bytes(bucket_name, variants[name][ext], body, VARIANT_FORMATS[ext][1])
+        for name, formats in rendered.items()
+        for ext, body in formats.items()
+        if (name, ext) != ("medium", "jpeg")
+    ]
+    await asyncio.gather(*uploads)
+    await upload_bytes(
+        bucket_name,
+        variants["medium"]["jpeg"],
+        rendered["medium"]["jpeg"],
+        VARIANT_FORMATS["jpeg"][1],
+    )
+    return variants
+
+
+async def _record_product_variants(product_id, key: str):
+    variants = await build_variants(PRODUCT_BUCKET, key)
+    async with AsyncSessionLocal() as db:
+        # Only attach if the product still points at the same original
+        await db.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.image_key == key)
+            .values(image_variants=variants)
+        )
+        await db.commit()
+    await bump_catalog_version()
+
+
+async def _record_profile_variants(user_id, key: str):
+    variants = await build_variants(PROFILE_BUCKET, key)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.profile_picture_key == key)
+            .values(profile_picture_variants=variants)
+        )
+        await db.commit()
+    invalidate_user(user_id)
+
+
+async def _run_job(job):
+    try:
+        await job
+        _stats["completed"] += 1
+    except Exception as e:
+        _stats["failed"] += 1
+        logging.error(f"Image variant generation failed: {e}", exc_info=True)
+
+
+def _schedule(job):
+    _stats["scheduled"] += 1
+    task = asyncio.create_task(_run_job(job))
+    _jobs.add(task)
+    task.add_done_callback(_jobs.discard)
+
+
+def schedule_product_variants(product_id, key: Optional[str]):
+    if key:
+        _schedule(_record_product_variants(product_id, key))
+
+
+def schedule_profile_variants(user_id, key: Optional[str]):
+    if key:
+        _schedule(_record_profile_variants(user_id, key))
+
+
+def get_image_variant_stats() -> dict:
+    return {**_stats, "in_progress": len(_jobs)}
+
+
+register_collector("image_variants", get_image_variant_stats)
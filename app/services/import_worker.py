@@ -0,0 +1,151 @@
+import asyncio
+import csv
+import logging
+import os
+import socket
+import tempfile
+import uuid
+from typing import Optional
+from ..core.config import settings
+from ..core.metrics import register_collector
+from ..db.session import AsyncSessionLocal
+from ..api.v1.imports import repository
+from ..api.v1.imports.model import ImportJob
+from ..api.v1.product import importer
+from ..api.v1.product.cache import bump_catalog_version
+from .s3_service import IMPORT_BUCKET, delete_object, download_fileobj
+
+# Identifies this process's leases in import_jobs.locked_by
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_task: Optional[asyncio.Task] = None
+_wakeup = asyncio.Event()
+_stats = {"jobs_completed": 0, "jobs_failed": 0, "jobs_resumed": 0, "rows": 0}
+
+
+async def start_import_worker():
+    global _task
+    _task = asyncio.create_task(_run())
+
+
+async def stop_import_worker():
+    _task.cancel()
+    await asyncio.gather(_task, return_exceptions=True)
+    # The interrupted chunk rolled back; hand the job to whoever starts next
+    async with AsyncSessionLocal() as db:
+        await repository.release_jobs(db, WORKER_ID)
+
+
+# Called after a job is created so it starts without waiting for the poll
+def notify_import_worker():
+    _wakeup.set()
+
+
+async def _run():
+    while True:
+        _wakeup.clear()
+        try:
+            while True:
+                async with AsyncSessionLocal() as db:
+                    job = await repository.claim_next_job(db, WORKER_ID)
+                if not job:
+                    break
+                try:
+                    await _process(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    await _handle_failure(job, e)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Import worker failed: {e}", exc_info=True)
+        try:
+            await asyncio.wait_for(
+                _wakeup.wait(), timeout=settings.IMPORT_POLL_INTERVAL_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _finish(job: ImportJob, status: str, detail: str = None):
+    async with AsyncSessionLocal() as db:
+        await repository.finish_job(db, job.id, WORKER_ID, status, detail)
+    await delete_object(IMPORT_BUCKET, job.object_key)
+    _stats["jobs_completed" if status == "completed" else "jobs_failed"] += 1
+
+
+# The job keeps its lease, so it is retried once the lease expires, until it
+# runs out of attempts
+async def _handle_failure(job: ImportJob, error: Exception):
+    logging.error(
+        f"Import {job.id} failed on attempt {job.attempts}: {error}", exc_info=True
+    )
+    if job.attempts >= settings.IMPORT_MAX_ATTEMPTS:
+        await _finish(job, "failed", f"Import failed: {error}")
+
+
+async def _process(job: ImportJob):
+    # A worker that crashed mid-job never got to record the failure
+    if job.attempts > settings.IMPORT_MAX_ATTEMPTS:
+        await _finish(job, "failed", "Import kept failing; giving up")
+        return
+    if job.rows_processed:
+        _stats["jobs_resumed"] += 1
+
+    with tempfile.TemporaryFile() as fileobj:
+        await download_fileobj(IMPORT_BUCKET, job.object_key, fileobj)
+        await asyncio.to_thread(fileobj.seek, 0)
+        try:
+            reader = await asyncio.to_thread(importer.open_csv, fileobj)
+            # Rows up to the last committed chunk are already in the catalog
+            await importer.skip_rows(reader, job.rows_processed)
+            completed = await _import_chunks(job, reader)
+        except (importer.ImportRowError, UnicodeDecodeError, csv.Error) as e:
+            await _finish(job, "failed", str(e))
+            return
+    if completed:
+        await _finish(job, "completed")
+
+
+async def _import_chunks(job: ImportJob, reader: csv.DictReader) -> bool:
+    rows_processed, added, skipped = job.rows_processed, job.added, job.skipped
+    error_count, errors = job.error_count, list(job.errors)
+
+    while batch := await importer.read_batch(reader, settings.CSV_IMPORT_BATCH_SIZE):
+        async with AsyncSessionLocal() as db:
+            result = await importer.import_batch(db, batch, rows_processed + 1)
+            rows_processed += len(batch)
+            added += result.added
+            skipped += result.skipped
+            error_count += len(result.errors)
+            errors.extend(result.errors[: settings.IMPORT_MAX_ERRORS - len(errors)])
+
+            # Rows and progress commit together, so a resume never repeats
+            # or loses a chunk
+            if not await repository.record_progress(
+                db,
+                job,
+                WORKER_ID,
+                rows_processed,
+                added,
+                skipped,
+                error_count,
+                errors,
+            ):
+                await db.rollback()
+                logging.warning(f"Lost the lease on import {job.id}; stopping")
+                return False
+            await db.commit()
+
+        _stats["rows"] += len(batch)
+        if result.added:
+            await bump_catalog_version()
+    return True
+
+
+def get_import_worker_stats() -> dict:
+    return {**_stats, "worker_id": WORKER_ID}
+
+
+register_collector("imports", get_import_worker_stats)
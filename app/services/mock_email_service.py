@@ -1,2 +1,15 @@
+from typing import List
+from .email_queue import OtpEmail
+
+
 async def send_otp_email(email: str, otp: str):
     print(f"Sending OTP to {email}: {otp}")  # Replace with SendGrid later
+
+
+class MockEmailTransport:
+    async def send(self, messages: List[OtpEmail]):
+        for message in messages:
+            await send_otp_email(message.email, message.otp)
+
+    async def aclose(self):
+        pass
@@ -1,9 +1,17 @@
 from fastapi import UploadFile
+from typing import Dict, Iterable, Optional
+from cachetools import LRUCache, TTLCache
 import boto3
+import hashlib
 import uuid
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from botocore.client import Config
+from botocore.exceptions import ClientError
 import asyncio
 from ..core.config import settings
+from ..core.metrics import register_collector
 
 # Config variables
 IS_DEVELOPMENT = settings.IS_DEVELOPMENT  # False = LocalStack, True = AWS
@@ -13,9 +21,15 @@ LOCALSTACK_ENDPOINT = settings.LOCALSTACK_ENDPOINT
 # Bucket names
 PRODUCT_BUCKET = "product-images"
 PROFILE_BUCKET = "profile-info"
+IMPORT_BUCKET = "product-imports"
 
 SIZE_OF_IMAGE = settings.MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
 
+# Streaming upload tuning
+READ_CHUNK_SIZE = 1024 * 1024
+MULTIPART_PART_SIZE = settings.S3_MULTIPART_PART_SIZE_MB * 1024 * 1024
+MULTIPART_CONCURRENCY = settings.S3_MULTIPART_CONCURRENCY
+
 # Initialize S3 client (reversed logic per your request)
 if not IS_DEVELOPMENT:
     # Use LocalStack when IS_DEVELOPMENT is False
@@ -25,7 +39,10 @@ if not IS_DEVELOPMENT:
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
         region_name=REGION,
-        config=Config(signature_version="s3v4"),
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        ),
     )
 else:
     # Use AWS S3 when IS_DEVELOPMENT is True
@@ -34,48 +51,324 @@ else:
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
         region_name=REGION,
+        config=Config(max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS),
     )
 
+# boto3 is blocking; give it its own pool, one thread per botocore connection,
+# so S3 calls neither block the event loop nor starve the default executor
+_s3_executor = ThreadPoolExecutor(
+    max_workers=settings.S3_MAX_POOL_CONNECTIONS, thread_name_prefix="s3"
+)
+_s3_stats = defaultdict(
+    lambda: {"calls": 0, "errors": 0, "in_flight": 0, "total_latency_ms": 0.0}
+)
+
+
+async def _call_s3(operation: str, **kwargs):
+    stats = _s3_stats[operation]
+    stats["in_flight"] += 1
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _s3_executor, lambda: getattr(s3, operation)(**kwargs)
+        )
+    except Exception:
+        stats["errors"] += 1
+        raise
+    finally:
+        stats["in_flight"] -= 1
+        stats["calls"] += 1
+        stats["total_latency_ms"] += (time.perf_counter() - start) * 1000
+
+
+def get_s3_stats() -> dict:
+    operations = {}
+    for operation, stats in _s3_stats.items():
+        avg = stats["total_latency_ms"] / stats["calls"] if stats["calls"] else 0
+        operations[operation] = {**stats, "avg_latency_ms": round(avg, 2)}
+    return {
+        "max_pool_connections": settings.S3_MAX_POOL_CONNECTIONS,
+        "operations": operations,
+    }
+
+
+register_collector("s3", get_s3_stats)
+
 
-# Ensure buckets exist (only for LocalStack)
-def ensure_buckets_exist():
+def shutdown_s3_executor():
+    _s3_executor.shutdown(wait=False)
+
+
+# Ensure buckets exist (only for LocalStack); run once from the app lifespan
+async def ensure_buckets_exist():
     if IS_DEVELOPMENT:
         return  # Skip bucket creation in AWS
 
-    existing_buckets = [b["Name"] for b in s3.list_buckets().get("Buckets", [])]
-    for bucket in [PRODUCT_BUCKET, PROFILE_BUCKET]:
+    response = await _call_s3("list_buckets")
+    existing_buckets = [b["Name"] for b in response.get("Buckets", [])]
+    for bucket in [PRODUCT_BUCKET, PROFILE_BUCKET, IMPORT_BUCKET]:
         if bucket not in existing_buckets:
-            s3.create_bucket(Bucket=bucket)
+            await _call_s3("create_bucket", Bucket=bucket)
             print(f"Created bucket: {bucket}")
 
 
-# Upload file to S3 and return presigned URL
-async def save_file_to_s3(file: UploadFile, bucket_name: str) -> str:
-    ensure_buckets_exist()
+class _SizeLimitedReader:
+    # Streams an upload in chunks and fails as soon as it crosses the limit,
+    # so oversized files are rejected without being buffered whole. The
+    # content is hashed on the way through for content-addressed keys.
+    def __init__(self, file: UploadFile, limit: int):
+        self.file = file
+        self.limit = limit
+        self.total = 0
+        self.sha256 = hashlib.sha256()
 
-    key = f"{uuid.uuid4()}_{file.filename}"
-    content = await file.read()
-    if len(content) > SIZE_OF_IMAGE:
-        raise ValueError("File size exceeds limit")
+    async def read_part(self, part_size: int) -> bytes:
+        part = bytearray()
+        while len(part) < part_size:
+            chunk = await self.file.read(min(READ_CHUNK_SIZE, part_size - len(part)))
+            if not chunk:
+                break
+            self.total += len(chunk)
+            if self.total > self.limit:
+                raise ValueError("File size exceeds limit")
+            self.sha256.update(chunk)
+            part.extend(chunk)
+        return bytes(part)
 
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(
-        None,
-        lambda: s3.put_object(
+    @property
+    def content_key(self) -> str:
+        return f"sha256/{self.sha256.hexdigest()}"
+
+
+# (bucket, key) pairs known to exist, so repeat uploads skip even the HEAD
+_known_objects = LRUCache(maxsize=settings.KNOWN_OBJECT_CACHE_SIZE)
+_dedup_stats = {"cache_hits": 0, "head_hits": 0, "uploads": 0, "bytes_saved": 0}
+
+
+async def object_exists(bucket_name: str, key: str) -> bool:
+    if (bucket_name, key) in _known_objects:
+        _dedup_stats["cache_hits"] += 1
+        return True
+    try:
+        await _call_s3("head_object", Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+    _known_objects[(bucket_name, key)] = True
+    _dedup_stats["head_hits"] += 1
+    return True
+
+
+def get_dedup_stats() -> dict:
+    checks = _dedup_stats["cache_hits"] + _dedup_stats["head_hits"]
+    checks += _dedup_stats["uploads"]
+    hit_rate = _dedup_stats["cache_hits"] / checks if checks else 0
+    return {**_dedup_stats, "cache_hit_rate": round(hit_rate, 4)}
+
+
+register_collector("s3_dedup", get_dedup_stats)
+
+
+async def _upload_part(bucket_name, key, upload_id, part_number, body, slots):
+    try:
+        response = await _call_s3(
+            "upload_part",
             Bucket=bucket_name,
             Key=key,
-            Body=content,
-            ContentType=file.content_type,
-        ),
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+    finally:
+        slots.release()
+
+
+# The content hash is only known once the last part is read, so parts go to
+# a staging key that is then either dropped (duplicate) or copied into place
+async def _multipart_upload(
+    reader: _SizeLimitedReader, first_part: bytes, bucket_name, content_type
+) -> str:
+    staging_key = f"staging/{uuid.uuid4()}"
+    upload = await _call_s3(
+        "create_multipart_upload",
+        Bucket=bucket_name,
+        Key=staging_key,
+        ContentType=content_type,
     )
+    upload_id = upload["UploadId"]
+
+    # Each slot is one part in memory/in flight, which bounds RSS per upload
+    slots = asyncio.Semaphore(MULTIPART_CONCURRENCY)
+    tasks = []
+    try:
+        part, part_number = first_part, 1
+        while part:
+            await slots.acquire()
+            tasks.append(
+                asyncio.create_task(
+                    _upload_part(
+                        bucket_name, staging_key, upload_id, part_number, part, slots
+                    )
+                )
+            )
+            part = await reader.read_part(MULTIPART_PART_SIZE)
+            part_number += 1
+        parts = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _call_s3(
+            "abort_multipart_upload",
+            Bucket=bucket_name,
+            Key=staging_key,
+            UploadId=upload_id,
+        )
+        raise
+
+    key = reader.content_key
+    if await object_exists(bucket_name, key):
+        await _call_s3(
+            "abort_multipart_upload",
+            Bucket=bucket_name,
+            Key=staging_key,
+            UploadId=upload_id,
+        )
+        _dedup_stats["bytes_saved"] += reader.total
+        return key
+
+    await _call_s3(
+        "complete_multipart_upload",
+        Bucket=bucket_name,
+        Key=staging_key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": parts},
+    )
+    await _call_s3(
+        "copy_object",
+        Bucket=bucket_name,
+        Key=key,
+        CopySource={"Bucket": bucket_name, "Key": staging_key},
+    )
+    await _call_s3("delete_object", Bucket=bucket_name, Key=staging_key)
+    _known_objects[(bucket_name, key)] = True
+    _dedup_stats["uploads"] += 1
+    return key
+
 
-    signed_url = s3.generate_presigned_url(
+# Upload file to S3 and return its content-addressed object key
+async def save_file_to_s3(file: UploadFile, bucket_name: str) -> str:
+    reader = _SizeLimitedReader(file, SIZE_OF_IMAGE)
+    first_part = await reader.read_part(MULTIPART_PART_SIZE)
+
+    if len(first_part) == MULTIPART_PART_SIZE:
+        return await _multipart_upload(
+            reader, first_part, bucket_name, file.content_type
+        )
+
+    # Small object: a single put is cheaper than a multipart round-trip
+    key = reader.content_key
+    if await object_exists(bucket_name, key):
+        _dedup_stats["bytes_saved"] += reader.total
+        return key
+
+    await _call_s3(
+        "put_object",
+        Bucket=bucket_name,
+        Key=key,
+        Body=first_part,
+        ContentType=file.content_type,
+    )
+    _known_objects[(bucket_name, key)] = True
+    _dedup_stats["uploads"] += 1
+    return key
+
+
+async def read_object(bucket_name: str, key: str) -> bytes:
+    response = await _call_s3("get_object", Bucket=bucket_name, Key=key)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_s3_executor, response["Body"].read)
+
+
+# Managed (multipart when large) transfers between S3 and a local file
+async def upload_fileobj(bucket_name: str, key: str, fileobj):
+    await _call_s3("upload_fileobj", Fileobj=fileobj, Bucket=bucket_name, Key=key)
+
+
+async def download_fileobj(bucket_name: str, key: str, fileobj):
+    await _call_s3("download_fileobj", Bucket=bucket_name, Key=key, Fileobj=fileobj)
+
+
+async def delete_object(bucket_name: str, key: str):
+    await _call_s3("delete_object", Bucket=bucket_name, Key=key)
+
+
+async def upload_bytes(bucket_name: str, key: str, body: bytes, content_type: str):
+    await _call_s3(
+        "put_object", Bucket=bucket_name, Key=key, Body=body, ContentType=content_type
+    )
+
+
+# Presigned URLs are reused until shortly before they expire, so reads after
+# warm-up don't pay for signing
+_presigned_urls = TTLCache(
+    maxsize=settings.PRESIGNED_URL_CACHE_SIZE,
+    ttl=settings.PRESIGNED_URL_EXPIRES_SECONDS
+    - settings.PRESIGNED_URL_REFRESH_MARGIN_SECONDS,
+)
+_presign_stats = {"hits": 0, "misses": 0}
+
+
+def _sign(bucket_name: str, key: str) -> str:
+    return s3.generate_presigned_url(
         ClientMethod="get_object",
         Params={"Bucket": bucket_name, "Key": key},
-        ExpiresIn=300,
+        ExpiresIn=settings.PRESIGNED_URL_EXPIRES_SECONDS,
+    )
+
+
+# Returns key -> URL for every given key. Uncached keys are signed in one trip
+# to the S3 pool, never on the event loop.
+async def presign_urls(
+    bucket_name: str, keys: Iterable[Optional[str]]
+) -> Dict[str, str]:
+    urls, missing = {}, []
+    for key in {k for k in keys if k}:
+        url = _presigned_urls.get((bucket_name, key))
+        if url is None:
+            missing.append(key)
+        else:
+            urls[key] = url
+    _presign_stats["hits"] += len(urls)
+    _presign_stats["misses"] += len(missing)
+    if not missing:
+        return urls
+
+    loop = asyncio.get_running_loop()
+    signed = await loop.run_in_executor(
+        _s3_executor, lambda: [_sign(bucket_name, k) for k in missing]
     )
+    for key, url in zip(missing, signed):
+        _presigned_urls[(bucket_name, key)] = url
+        urls[key] = url
+    return urls
+
+
+# Changes every PRESIGNED_URL_REFRESH_MARGIN_SECONDS. Cached URLs always have at
+# least that long left, so a response revalidated within the epoch it was
+# served in still carries live links.
+def presigned_url_epoch() -> int:
+    return int(time.time()) // settings.PRESIGNED_URL_REFRESH_MARGIN_SECONDS
+
 
-    return signed_url
+def get_presign_stats() -> dict:
+    return {**_presign_stats, "cached": len(_presigned_urls)}
+
+
+register_collector("presigned_urls", get_presign_stats)
 
 
 # Bucket-specific upload wrappers
@@ -83,5 +376,12 @@ async def save_product_image(file: UploadFile) -> str:
     return await save_file_to_s3(file, PRODUCT_BUCKET)
 
 
+# CSV uploads are kept only until their import job finishes
+async def save_import_file(file: UploadFile) -> str:
+    key = f"imports/{uuid.uuid4()}.csv"
+    await upload_fileobj(IMPORT_BUCKET, key, file.file)
+    return key
+
+
 async def save_profile_info(file: UploadFile) -> str:
     return await save_file_to_s3(file, PROFILE_BUCKET)
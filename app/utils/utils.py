@@ -1,7 +1,7 @@
 import random
 import string
 from fastapi import UploadFile
-import httpx
+from ..core.http_client import get_http_client
 
 
 # OTP Generator
@@ -15,20 +15,25 @@ class DummyUploadFile:
         self.filename = filename
         self.content_type = content_type
 
-    async def read(self):
-        return self.content
+        self._offset = 0
+
+    async def read(self, size: int = -1):
+        if size < 0:
+            size = len(self.content) - self._offset
+        chunk = self.content[self._offset : self._offset + size]
+        self._offset += len(chunk)
+        return chunk
 
 
 async def download_image_as_upload_file(url: str) -> UploadFile:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        response.raise_for_status()
-
-        content_type = response.headers.get("content-type", "image/jpeg")
-        filename = url.split("/")[-1].split("?")[0]
-
-        return DummyUploadFile(
-            content=response.content,
-            filename=filename or "profile.jpg",
-            content_type=content_type,
-        )
+    response = await get_http_client().get(url)
+    response.raise_for_status()
+
+    content_type = response.headers.get("content-type", "image/jpeg")
+    filename = url.split("/")[-1].split("?")[0]
+
+    return DummyUploadFile(
+        content=response.content,
+        filename=filename or "profile.jpg",
+        content_type=content_type,
+    )
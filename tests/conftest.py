@@ -0,0 +1,104 @@
+import asyncio
+import os
+import re
+import uuid
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# Settings require these; the tests never call Google or AWS for real
+for name in ("GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("REGION", "us-east-1")
+os.environ.setdefault("aws_access_key_id", "test")
+os.environ.setdefault("aws_secret_access_key", "test")
+os.environ.setdefault("DATABASE_CONNECTION", "postgresql+asyncpg://localhost/test")
+
+# moto stands in for LocalStack
+os.environ.setdefault(
+    "MOTO_S3_CUSTOM_ENDPOINTS",
+    os.environ.get("LOCALSTACK_ENDPOINT", "http://localhost:4566"),
+)
+# moto hooks botocore when imported, so it must come before the app's S3 client
+import moto  # noqa: E402,F401
+
+from app.db.schema_check import is_schema_compatible  # noqa: E402
+from app.db.session import async_engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def run():
+    # One loop for the whole session, since the app's engine pools connections
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def database(run):
+    # DATABASE_CONNECTION should point at a scratch database migrated to head
+    async def current_revision():
+        async with async_engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            return result.scalar()
+
+    try:
+        current = run(current_revision())
+    except (OSError, DBAPIError) as e:
+        pytest.skip(f"Test database unavailable: {e}")
+    if not is_schema_compatible(current):
+        pytest.skip("Test database is not at the latest migration")
+    return async_engine
+
+
+# A throwaway category; deleting it cascades to the test's products
+@pytest.fixture
+def category(run, database):
+    category_id = uuid.uuid4()
+
+    async def execute(sql: str):
+        async with database.begin() as conn:
+            await conn.execute(text(sql), {"id": category_id})
+
+    run(
+        execute(f"INSERT INTO categories (id, name) VALUES (:id, 'test-{category_id}')")
+    )
+    yield category_id
+    run(execute("DELETE FROM categories WHERE id = :id"))
+
+
+# A connection inside a transaction where `products` is an empty temporary
+# copy, so plans and timings don't depend on rows (or dead tuples) other tests
+# left behind. Unqualified names resolve to pg_temp first, and the copy's
+# indexes are renamed to match so plans read the same. Rolled back at the end.
+@pytest.fixture(scope="module")
+def products_sandbox(run, database):
+    conn = run(database.connect())
+    transaction = run(conn.begin())
+
+    async def shadow_products():
+        await conn.execute(
+            text("CREATE TEMP TABLE products (LIKE public.products INCLUDING ALL)")
+        )
+        indexes = await conn.execute(
+            text(
+                "SELECT schemaname = 'public', indexname, indexdef FROM pg_indexes"
+                " WHERE tablename = 'products' AND schemaname IN"
+                " ('public', pg_my_temp_schema()::regnamespace::text)"
+            )
+        )
+        names = {True: {}, False: {}}
+        for public, name, definition in indexes.all():
+            names[public][re.sub(r"INDEX \S+ ON \S+", "", definition)] = name
+        for definition, name in names[False].items():
+            public_name = names[True][definition]
+            if name != public_name:
+                await conn.execute(
+                    text(f'ALTER INDEX pg_temp."{name}" RENAME TO "{public_name}"')
+                )
+
+    run(shadow_products())
+    yield conn
+    run(transaction.rollback())
+    run(conn.close())
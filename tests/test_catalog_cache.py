@@ -0,0 +1,127 @@
+from collections import Counter
+import pytest
+from pydantic import TypeAdapter
+from app.api.v1.category import repository as category_repository
+from app.api.v1.category.schema import CategoryUpdate
+from app.api.v1.product import cache
+from app.db.session import AsyncSessionLocal
+
+NUMBERS = TypeAdapter(list[int])
+
+
+# Stands in for redis.asyncio: just the calls the backend makes
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+class BrokenRedis:
+    async def _fail(self, *args, **kwargs):
+        raise ConnectionError("Connection refused")
+
+    get = set = incr = _fail
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    for name in ("_hits", "_misses", "_errors"):
+        monkeypatch.setattr(cache, name, Counter())
+    return cache.get_catalog_cache_stats
+
+
+def use_backend(monkeypatch, backend):
+    monkeypatch.setattr(cache, "_backend", backend)
+    return backend
+
+
+def test_second_read_is_a_hit(run, monkeypatch, stats):
+    use_backend(monkeypatch, cache.InMemoryCatalogCacheBackend(100, 60))
+    load = Loader([1, 2, 3])
+    for _ in range(2):
+        assert run(cache.read_through("products", ("a",), NUMBERS, load)) == [1, 2, 3]
+    other_key = run(cache.read_through("products", ("b",), NUMBERS, load))
+    assert other_key == [1, 2, 3]
+    assert load.calls == 2
+    assert stats()["products"] == {
+        "hits": 1,
+        "misses": 2,
+        "errors": 0,
+        "hit_ratio": 0.3333,
+    }
+
+
+def test_version_bump_invalidates_entries(run, monkeypatch):
+    use_backend(monkeypatch, cache.InMemoryCatalogCacheBackend(100, 60))
+    load = Loader([1])
+    run(cache.read_through("products", ("a",), NUMBERS, load))
+    run(cache.bump_catalog_version())
+    run(cache.read_through("products", ("a",), NUMBERS, load))
+    assert load.calls == 2
+
+
+def test_redis_backend_is_shared_between_workers(run, monkeypatch):
+    # Two workers, each with its own backend over the same Redis
+    redis = FakeRedis()
+    first = cache.RedisCatalogCacheBackend(redis)
+    second = cache.RedisCatalogCacheBackend(redis)
+    load = Loader([7])
+
+    use_backend(monkeypatch, first)
+    run(cache.read_through("facets", ("a",), NUMBERS, load))
+    use_backend(monkeypatch, second)
+    assert run(cache.read_through("facets", ("a",), NUMBERS, load)) == [7]
+    assert load.calls == 1
+
+    # A write through the second worker invalidates the first one's reads
+    run(cache.bump_catalog_version())
+    use_backend(monkeypatch, first)
+    run(cache.read_through("facets", ("a",), NUMBERS, load))
+    assert load.calls == 2
+    assert redis.data[cache.VERSION_KEY] == 1
+
+
+def test_unreachable_backend_falls_through_to_loader(run, monkeypatch, stats):
+    use_backend(monkeypatch, cache.RedisCatalogCacheBackend(BrokenRedis()))
+    load = Loader([1])
+    assert run(cache.read_through("products", ("a",), NUMBERS, load)) == [1]
+    run(cache.bump_catalog_version())
+    assert load.calls == 1
+    assert stats()["products"]["errors"] == 1
+    assert stats()["version"]["errors"] == 1
+
+
+def test_category_changes_bump_the_version(run, monkeypatch, category):
+    backend = use_backend(monkeypatch, cache.RedisCatalogCacheBackend(FakeRedis()))
+
+    async def rename_then_delete():
+        async with AsyncSessionLocal() as db:
+            await category_repository.update_category(
+                db,
+                category,
+                CategoryUpdate(name=f"renamed-{category}", description=None),
+            )
+            renamed = await backend.get_version()
+            await category_repository.delete_category(db, category)
+            return renamed, await backend.get_version()
+
+    assert run(rename_then_delete()) == (1, 2)
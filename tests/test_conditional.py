@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from starlette.requests import Request
+from app.core.conditional import has_conditional_headers, is_not_modified, rows_etag
+from app.services import s3_service
+
+UPDATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()
+            ],
+        }
+    )
+
+
+def test_weak_etag_matches_either_form():
+    etag = rows_etag([("id", UPDATED_AT)], weak=True)
+    assert etag.startswith('W/"')
+    assert is_not_modified(_request(if_none_match=etag), etag)
+    assert is_not_modified(_request(if_none_match=etag[2:]), etag)
+    assert not is_not_modified(_request(if_none_match='"other"'), etag)
+
+
+def test_product_etag_changes_with_signing_epoch(monkeypatch):
+    from app.api.v1.product import endpoints
+
+    rows = [("id", UPDATED_AT)]
+    monkeypatch.setattr(endpoints, "presigned_url_epoch", lambda: 1)
+    first = endpoints._etag(rows)
+    monkeypatch.setattr(endpoints, "presigned_url_epoch", lambda: 2)
+    assert endpoints._etag(rows) != first
+
+
+def test_signing_epoch_follows_refresh_margin(monkeypatch):
+    monkeypatch.setattr(s3_service.time, "time", lambda: 1000.0)
+    monkeypatch.setattr(
+        s3_service.settings, "PRESIGNED_URL_REFRESH_MARGIN_SECONDS", 300
+    )
+    assert s3_service.presigned_url_epoch() == 3
+
+
+def test_if_modified_since_alone_only_counts_where_last_modified_is_sent():
+    since = _request(if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT")
+    assert not has_conditional_headers(since)
+    assert has_conditional_headers(since, last_modified=True)
+    assert has_conditional_headers(_request(if_none_match='"x"'))
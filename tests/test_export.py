@@ -0,0 +1,91 @@
+import csv
+import io
+import os
+import orjson
+import psutil
+from sqlalchemy import text
+from app.api.v1.product.exporter import export_products
+from app.api.v1.product.importer import parse_row
+
+ROWS = int(os.getenv("EXPORT_TEST_ROWS", "100000"))
+MB = 1024 * 1024
+
+
+def _insert_products(run, database, category_id, count):
+    async def insert():
+        async with database.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO products (id, name, description, price, stock,"
+                    " category_id, is_active, created_at, updated_at)"
+                    " SELECT gen_random_uuid(), 'Export product ' || g,"
+                    " 'Description ' || g, g % 1000 + 0.99, g % 50, :category_id,"
+                    " true, now() - g * interval '1 second', now()"
+                    " FROM generate_series(1, :count) AS g"
+                ),
+                {"category_id": category_id, "count": count},
+            )
+
+    run(insert())
+
+
+def test_export_streams_with_flat_memory(run, database, category):
+    _insert_products(run, database, category, ROWS)
+    process = psutil.Process()
+
+    async def consume():
+        rows, baseline, peak = 0, None, 0
+        async for chunk in export_products("ndjson", category_id=category):
+            rows += chunk.count(b"\n")
+            rss = process.memory_info().rss
+            # Measure growth once the first batches have warmed up the pools
+            if baseline is None and rows >= ROWS // 20:
+                baseline = rss
+            peak = max(peak, rss)
+        return rows, baseline, peak, chunk
+
+    rows, baseline, peak, last_chunk = run(consume())
+    assert rows == ROWS
+    # Newest first, so the last row exported is the oldest one inserted
+    last = orjson.loads(last_chunk.splitlines()[-1])
+    assert last["name"] == f"Export product {ROWS}"
+    assert peak - baseline < 32 * MB
+
+
+def test_csv_export_has_header_and_rows(run, database, category):
+    _insert_products(run, database, category, 3)
+
+    async def collect():
+        return b"".join([c async for c in export_products("csv", category_id=category)])
+
+    lines = run(collect()).decode().splitlines()
+    assert lines[0].split(",")[:3] == ["name", "description", "price"]
+    assert [line.split(",")[0] for line in lines[1:]] == [
+        "Export product 1",
+        "Export product 2",
+        "Export product 3",
+    ]
+
+
+def test_csv_export_round_trips_through_the_importer(run, database, category):
+    _insert_products(run, database, category, 1)
+
+    async def set_image_key():
+        async with database.begin() as conn:
+            await conn.execute(
+                text(
+                    "UPDATE products SET image_key = 'ab/cd.png' WHERE category_id = :id"
+                ),
+                {"id": category},
+            )
+
+    async def collect():
+        return b"".join([c async for c in export_products("csv", category_id=category)])
+
+    run(set_image_key())
+    exported = run(collect()).decode()
+    (row,) = csv.DictReader(io.StringIO(exported))
+    values = parse_row(row)
+    assert values["name"] == "Export product 1"
+    assert values["category_id"] == category
+    assert values["image_key"] == "ab/cd.png"
@@ -0,0 +1,119 @@
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+from app.api.v1.auth import google_verifier
+from app.core.config import settings
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class SigningKey:
+    def __init__(self, kid):
+        self.kid = kid
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self.jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid}
+
+    def id_token(self):
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": settings.GOOGLE_CLIENT_ID,
+            "sub": "1234",
+            "email": "user@example.com",
+            "exp": 4102444800,
+        }
+        return jwt.encode(
+            claims, self.private_pem, algorithm="RS256", headers={"kid": self.kid}
+        )
+
+
+# Serves whatever keys the test currently publishes, like Google's certs URL
+class JwksServer:
+    def __init__(self, keys, max_age=600):
+        self.keys = keys
+        self.clock = Clock()
+        self.max_age = max_age
+        self.requests = 0
+
+    def __call__(self, request):
+        self.requests += 1
+        return httpx.Response(
+            200,
+            json={"keys": [key.jwk for key in self.keys]},
+            headers={"Cache-Control": f"public, max-age={self.max_age}"},
+        )
+
+
+@pytest.fixture
+def jwks(run, monkeypatch):
+    server = JwksServer([SigningKey("key-1")])
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    monkeypatch.setattr(google_verifier, "get_http_client", lambda: client)
+    monkeypatch.setattr(google_verifier, "time", server.clock)
+    monkeypatch.setattr(
+        google_verifier,
+        "_jwks",
+        {"keys": None, "expires_at": 0.0, "fetched_at": 0.0},
+    )
+    monkeypatch.setattr(google_verifier, "_background_refresh", None)
+    yield server
+    run(client.aclose())
+
+
+def test_keys_are_cached_for_max_age(run, jwks):
+    token = jwks.keys[0].id_token()
+    for _ in range(3):
+        claims = run(google_verifier.verify_google_id_token(token))
+        assert claims["email"] == "user@example.com"
+    assert jwks.requests == 1
+    assert google_verifier._jwks["expires_at"] == jwks.clock.now + 600
+
+
+def test_keys_are_refreshed_in_background_before_expiry(run, jwks):
+    token = jwks.keys[0].id_token()
+    run(google_verifier.verify_google_id_token(token))
+    jwks.clock.now += 600 - google_verifier.REFRESH_AHEAD_SECONDS + 1
+
+    async def verify_then_wait_for_refresh():
+        claims = await google_verifier.verify_google_id_token(token)
+        # Answered from the cached keys; the refetch runs afterwards
+        fetched_before_refresh = jwks.requests
+        await google_verifier._background_refresh
+        return claims, fetched_before_refresh
+
+    claims, fetched_before_refresh = run(verify_then_wait_for_refresh())
+    assert claims["sub"] == "1234"
+    assert (fetched_before_refresh, jwks.requests) == (1, 2)
+    assert google_verifier._jwks["fetched_at"] == jwks.clock.now
+
+
+def test_unknown_kid_forces_a_refetch(run, jwks):
+    run(google_verifier.verify_google_id_token(jwks.keys[0].id_token()))
+    rotated = SigningKey("key-2")
+    jwks.keys = [rotated]
+
+    # Too soon after the last fetch: the token is rejected without a refetch
+    with pytest.raises(JWTError):
+        run(google_verifier.verify_google_id_token(rotated.id_token()))
+    assert jwks.requests == 1
+
+    jwks.clock.now += google_verifier.MIN_FORCED_REFRESH_SECONDS + 1
+    claims = run(google_verifier.verify_google_id_token(rotated.id_token()))
+    assert claims["sub"] == "1234"
+    assert jwks.requests == 2
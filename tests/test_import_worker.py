@@ -0,0 +1,69 @@
+import pytest
+from moto import mock_aws
+from sqlalchemy import text
+from app.api.v1.imports import repository
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services import import_worker, s3_service
+
+
+@pytest.fixture
+def job(run, database):
+    async def create():
+        async with AsyncSessionLocal() as db:
+            # The object is never uploaded, so every download fails
+            return await repository.create_job(db, "broken.csv", "imports/missing.csv")
+
+    job = run(create())
+    yield job
+
+    async def delete():
+        async with database.begin() as conn:
+            await conn.execute(
+                text("DELETE FROM import_jobs WHERE id = :id"), {"id": job.id}
+            )
+
+    run(delete())
+
+
+def _attempt(run, job_id):
+    async def claim_and_process():
+        async with AsyncSessionLocal() as db:
+            claimed = await repository.claim_next_job(db, import_worker.WORKER_ID)
+        assert claimed.id == job_id
+        try:
+            await import_worker._process(claimed)
+        except Exception as e:
+            await import_worker._handle_failure(claimed, e)
+        async with AsyncSessionLocal() as db:
+            return await repository.get_job(db, job_id)
+
+    return run(claim_and_process())
+
+
+def _expire_lease(run, database, job_id):
+    async def expire():
+        async with database.begin() as conn:
+            await conn.execute(
+                text("UPDATE import_jobs SET locked_until = now() WHERE id = :id"),
+                {"id": job_id},
+            )
+
+    run(expire())
+
+
+def test_failing_job_is_retried_then_marked_failed(run, database, job, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_ATTEMPTS", 2)
+    with mock_aws():
+        s3_service.s3.create_bucket(Bucket=s3_service.IMPORT_BUCKET)
+
+        first = _attempt(run, job.id)
+        # Still leased, so it is retried only after the lease runs out
+        assert (first.status, first.attempts) == ("running", 1)
+        assert first.locked_by == import_worker.WORKER_ID
+
+        _expire_lease(run, database, job.id)
+        second = _attempt(run, job.id)
+    assert (second.status, second.attempts) == ("failed", 2)
+    assert second.locked_by is None
+    assert "Import failed" in second.detail
@@ -0,0 +1,93 @@
+import uuid
+import pytest
+from sqlalchemy import text
+from app.api.v1.product.importer import ImportRowError, import_batch, parse_row
+from app.db.session import AsyncSessionLocal
+
+
+def _row(name, category_id, **fields):
+    return {
+        "name": name,
+        "price": "9.99",
+        "stock": "1",
+        "category_id": str(category_id),
+        **fields,
+    }
+
+
+# Each breaks one products constraint the database would otherwise raise on
+@pytest.mark.parametrize(
+    "fields, error",
+    [
+        ({"name": ""}, "name: String should have at least 3 characters"),
+        ({"name": "x" * 101}, "name: String should have at most 100 characters"),
+        ({"price": "0"}, "price: Input should be greater than 0"),
+        ({"price": "-5"}, "price: Input should be greater than 0"),
+        ({"price": "1e12"}, "price: Decimal input should have no more than 10 digits"),
+        ({"price": "9.999"}, "price: Decimal input should have no more than 2 decimal"),
+        ({"price": "abc"}, "price: Input should be a valid decimal"),
+        ({"stock": "-1"}, "stock: Input should be greater than or equal to 0"),
+        ({"category_id": "nope"}, "category_id: Input should be a valid UUID"),
+    ],
+)
+def test_invalid_rows_are_rejected(fields, error):
+    row = {**_row("Lamp", uuid.uuid4()), **fields}
+    with pytest.raises(ImportRowError, match=error):
+        parse_row(row)
+
+
+def test_bad_rows_are_reported_without_aborting_the_batch(run, category):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            result = await import_batch(
+                db,
+                [
+                    _row("Lamp", category),
+                    _row("x" * 150, category),
+                    _row("Desk", category, price="1e12"),
+                    _row("Chair", category, stock="-3"),
+                    _row("Shelf", category),
+                ],
+                1,
+            )
+            await db.commit()
+            names = await db.execute(
+                text("SELECT name FROM products WHERE category_id = :id ORDER BY name"),
+                {"id": category},
+            )
+            return result, names.scalars().all()
+
+    result, names = run(scenario())
+    assert (result.added, result.skipped) == (2, 0)
+    assert [e["row"] for e in result.errors] == [2, 3, 4]
+    assert names == ["Lamp", "Shelf"]
+
+
+def test_import_skips_active_duplicates_but_reuses_deleted_names(run, category):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            first = await import_batch(
+                db, [_row("Lamp", category), _row("Desk", category)], 1
+            )
+            await db.commit()
+            await db.execute(
+                text("UPDATE products SET is_active = false WHERE name = 'Desk'")
+            )
+            await db.commit()
+            second = await import_batch(
+                db, [_row("Lamp", category), _row("Desk", category)], 1
+            )
+            await db.commit()
+            counts = await db.execute(
+                text(
+                    "SELECT name, count(*) FROM products WHERE category_id = :id"
+                    " GROUP BY name ORDER BY name"
+                ),
+                {"id": category},
+            )
+            return first, second, counts.all()
+
+    first, second, counts = run(scenario())
+    assert (first.added, first.skipped) == (2, 0)
+    assert (second.added, second.skipped) == (1, 1)
+    assert counts == [("Desk", 2), ("Lamp", 1)]
@@ -0,0 +1,95 @@
+import asyncio
+import statistics
+import time
+import uuid
+import httpx
+import pytest
+from sqlalchemy import text
+from app.api.v1.auth import endpoints as auth_endpoints
+from app.core import rate_limit
+from app.core.security import get_password_hash, verify_password
+from app.main import app
+
+LOGINS = 16
+PASSWORD = "Storm-password-1"
+
+
+@pytest.fixture
+def storm_user(run, database, monkeypatch):
+    # The storm is many logins from one IP for one email; don't throttle it
+    monkeypatch.setattr(rate_limit.settings, "AUTH_RATE_LIMIT_PER_IP", 10_000)
+    monkeypatch.setattr(rate_limit.settings, "AUTH_RATE_LIMIT_PER_EMAIL", 10_000)
+    monkeypatch.setattr(rate_limit, "_backend", rate_limit.InMemoryRateLimitBackend())
+    user_id = uuid.uuid4()
+    email = f"storm-{user_id}@example.com"
+
+    async def execute(sql: str, **params):
+        async with database.begin() as conn:
+            await conn.execute(text(sql), {"id": user_id, **params})
+
+    run(
+        execute(
+            "INSERT INTO users (id, name, email, hashed_password, auth_provider,"
+            " created_at, is_verified)"
+            " VALUES (:id, 'storm', :email, :hashed, 'Manual', now(), true)",
+            email=email,
+            hashed=get_password_hash(PASSWORD),
+        )
+    )
+    yield email
+    run(execute("DELETE FROM users WHERE id = :id"))
+
+
+def _client(**kwargs) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test", **kwargs)
+
+
+async def _login(email: str) -> httpx.Response:
+    # A fresh client per login, since a client holding the cookie is refused
+    async with _client() as client:
+        return await client.post(
+            "/auth/login", json={"email": email, "password": PASSWORD}
+        )
+
+
+async def _products_p99_during_storm(email: str, category) -> tuple[float, int]:
+    token = (await _login(email)).json()["access_token"]
+    async with _client(cookies={"access_token": token}) as reader:
+        params = {"category_id": str(category)}
+        assert (await reader.get("/products", params=params)).status_code == 200
+
+        storm = asyncio.gather(*(_login(email) for _ in range(LOGINS)))
+        latencies = []
+        while not storm.done():
+            start = time.perf_counter()
+            response = await reader.get("/products", params=params)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+        assert all(r.status_code == 200 for r in await storm)
+
+    if len(latencies) < 2:
+        return latencies[0], 1
+    return statistics.quantiles(latencies, n=100)[98], len(latencies)
+
+
+# Benchmark: logins hash on a small thread pool, so catalog reads keep being
+# served while a burst of bcrypt verifications is in flight. The baseline
+# verifies on the event loop, which is what login did before.
+def test_login_storm_does_not_stall_product_reads(
+    run, category, storm_user, monkeypatch
+):
+    pooled, pooled_requests = run(_products_p99_during_storm(storm_user, category))
+
+    async def verify_on_loop(plain, hashed):
+        return verify_password(plain, hashed)
+
+    monkeypatch.setattr(auth_endpoints, "verify_password_async", verify_on_loop)
+    on_loop, on_loop_requests = run(_products_p99_during_storm(storm_user, category))
+
+    print(
+        f"\nGET /products p99 during {LOGINS} logins:"
+        f" {pooled * 1000:.1f} ms over {pooled_requests} requests with the hash pool,"
+        f" {on_loop * 1000:.1f} ms over {on_loop_requests} hashing on the loop"
+    )
+    assert pooled < on_loop / 3
@@ -0,0 +1,77 @@
+import os
+import statistics
+import time
+import uuid
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.product import repository
+
+ROWS = int(os.getenv("PAGINATION_TEST_ROWS", "200000"))
+LIMIT = 10
+DEEP_PAGE = 10000
+MS = 1000
+
+
+@pytest.fixture(scope="module")
+def catalog(run, products_sandbox):
+    conn = products_sandbox
+    # Search indexes play no part in listing and dominate the seeding time
+    run(
+        conn.execute(
+            text(
+                "DROP INDEX pg_temp.ix_products_active_search_vector,"
+                " pg_temp.ix_products_active_name_trgm"
+            )
+        )
+    )
+    run(
+        conn.execute(
+            text(
+                "INSERT INTO products (id, name, description, price, stock,"
+                " category_id, is_active, created_at, updated_at)"
+                " SELECT gen_random_uuid(), md5(g::text) || ' lamp',"
+                " 'Description ' || g, g % 1000 + 0.99, g % 50, :category_id,"
+                " true, now() - (g::bigint * 7919 % :rows) * interval '1 second', now()"
+                " FROM generate_series(1, :rows) AS g"
+            ),
+            {"category_id": uuid.uuid4(), "rows": ROWS},
+        )
+    )
+    run(conn.execute(text("ANALYZE products")))
+    return AsyncSession(bind=conn)
+
+
+def _latency_ms(run, fetch, rounds=5) -> float:
+    async def timed():
+        start = time.perf_counter()
+        products = await fetch()
+        assert len(products) == LIMIT
+        return (time.perf_counter() - start) * MS
+
+    return statistics.median(run(timed()) for _ in range(rounds))
+
+
+# Benchmark: page 1 vs page 10,000 (10 per page), by OFFSET and by cursor
+def test_deep_cursor_page_is_as_fast_as_the_first(run, catalog):
+    skip = (DEEP_PAGE - 1) * LIMIT
+    assert ROWS >= skip + LIMIT
+    (last,) = run(repository.get_products(catalog, skip - 1, 1))
+    after = repository.decode_cursor(repository.encode_cursor(last))
+
+    first = _latency_ms(run, lambda: repository.get_products(catalog, 0, LIMIT))
+    offset = _latency_ms(run, lambda: repository.get_products(catalog, skip, LIMIT))
+    cursor = _latency_ms(
+        run, lambda: repository.get_products(catalog, 0, LIMIT, after=after)
+    )
+    print(
+        f"\n{ROWS} products: page 1 {first:.1f} ms, page {DEEP_PAGE}"
+        f" {offset:.1f} ms by offset, {cursor:.1f} ms by cursor"
+    )
+
+    deep_by_offset = run(repository.get_products(catalog, skip, LIMIT))
+    deep_by_cursor = run(repository.get_products(catalog, 0, LIMIT, after=after))
+    assert [p.id for p in deep_by_cursor] == [p.id for p in deep_by_offset]
+    # OFFSET walks every skipped row; the cursor seeks straight to the page
+    assert cursor < offset / 5
+    assert cursor < first * 3 + 2
@@ -0,0 +1,23 @@
+import threading
+from app.services import s3_service
+
+
+def test_presign_urls_signs_off_the_event_loop(run, monkeypatch):
+    signing_threads = []
+
+    def sign(bucket_name, key):
+        signing_threads.append(threading.current_thread())
+        return f"https://signed/{bucket_name}/{key}"
+
+    monkeypatch.setattr(s3_service, "_sign", sign)
+    s3_service._presigned_urls.clear()
+
+    urls = run(s3_service.presign_urls("bucket", ["a", None, "b", "a"]))
+    assert urls == {"a": "https://signed/bucket/a", "b": "https://signed/bucket/b"}
+    assert threading.main_thread() not in signing_threads
+
+    # Cached keys are returned without signing again
+    assert run(s3_service.presign_urls("bucket", ["b"])) == {
+        "b": "https://signed/bucket/b"
+    }
+    assert len(signing_threads) == 2
@@ -0,0 +1,189 @@
+import uuid
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import text
+from app.api.v1.product import repository
+from app.api.v1.product.repository import DUPLICATE_NAME
+from app.api.v1.product.schema import BatchUpdate, ProductBatchRequest
+from app.db.session import AsyncSessionLocal
+
+
+@pytest.mark.parametrize("field", ["name", "price", "category_id"])
+def test_batch_update_rejects_null_for_required_columns(field):
+    operation = {"op": "update", "id": str(uuid.uuid4()), field: None}
+    with pytest.raises(ValidationError, match=f"{field} cannot be null"):
+        ProductBatchRequest(operations=[operation])
+
+
+def test_batch_update_allows_clearing_nullable_columns():
+    update = BatchUpdate(op="update", id=uuid.uuid4(), description=None, price="5")
+    assert update.model_dump(exclude_unset=True, exclude={"op", "id"}) == {
+        "description": None,
+        "price": 5,
+    }
+
+
+def _apply(run, operations):
+    async def apply():
+        async with AsyncSessionLocal() as db:
+            request = ProductBatchRequest(operations=operations)
+            return await repository.apply_product_batch(db, request.operations)
+
+    return [(r["op"], r["status"], r.get("error")) for r in run(apply())]
+
+
+def _active_products(run, category):
+    async def select_products():
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text(
+                    "SELECT name, price FROM products"
+                    " WHERE is_active AND category_id = :id ORDER BY name"
+                ),
+                {"id": category},
+            )
+            return [(name, float(price)) for name, price in result]
+
+    return run(select_products())
+
+
+def _create(name, category, price="10"):
+    return {"op": "create", "name": name, "price": price, "category_id": category}
+
+
+def _create_products(run, *operations):
+    results = _apply(run, list(operations))
+    assert all(status == "created" for _, status, _ in results)
+
+
+def _ids(run, category):
+    async def select_ids():
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("SELECT name, id FROM products WHERE category_id = :id"),
+                {"id": category},
+            )
+            return dict(result.all())
+
+    return run(select_ids())
+
+
+def test_mixed_batch_applies_every_kind(run, category):
+    _create_products(run, _create("Lamp", category), _create("Desk", category))
+    ids = _ids(run, category)
+    results = _apply(
+        run,
+        [
+            _create("Chair", category, "25"),
+            {"op": "update", "id": ids["Lamp"], "price": "12.5"},
+            {"op": "delete", "id": ids["Desk"]},
+        ],
+    )
+    assert results == [
+        ("create", "created", None),
+        ("update", "updated", None),
+        ("delete", "deleted", None),
+    ]
+    assert _active_products(run, category) == [("Chair", 25), ("Lamp", 12.5)]
+
+
+def test_unknown_category_and_product_fail_only_their_items(run, category):
+    missing = str(uuid.uuid4())
+    results = _apply(
+        run,
+        [
+            _create("Lamp", missing),
+            {"op": "update", "id": missing, "price": "5"},
+            {"op": "delete", "id": missing},
+            _create("Desk", category),
+        ],
+    )
+    assert results == [
+        ("create", "error", "Category ID is not valid"),
+        ("update", "error", "Product not found"),
+        ("delete", "error", "Product not found"),
+        ("create", "created", None),
+    ]
+    assert _active_products(run, category) == [("Desk", 10)]
+
+
+def test_duplicate_names_fail_only_their_items(run, category):
+    _create_products(run, _create("Lamp", category), _create("Desk", category))
+    ids = _ids(run, category)
+    results = _apply(
+        run,
+        [
+            _create("Lamp", category),
+            _create("Chair", category),
+            _create("Chair", category),
+            {"op": "update", "id": ids["Desk"], "name": "Lamp"},
+            {"op": "update", "id": ids["Desk"], "price": "7"},
+        ],
+    )
+    assert results == [
+        ("create", "error", DUPLICATE_NAME),
+        ("create", "created", None),
+        ("create", "error", DUPLICATE_NAME),
+        ("update", "error", DUPLICATE_NAME),
+        ("update", "updated", None),
+    ]
+    assert _active_products(run, category) == [("Chair", 10), ("Desk", 7), ("Lamp", 10)]
+
+
+def test_operations_apply_in_request_order(run, category):
+    _create_products(run, _create("Lamp", category), _create("Desk", category))
+    ids = _ids(run, category)
+    results = _apply(
+        run,
+        [
+            # Deleting frees the name for the create that follows
+            {"op": "delete", "id": ids["Lamp"]},
+            _create("Lamp", category, "30"),
+            # Renaming frees "Desk" for the create after it, not the one before
+            _create("Desk", category),
+            {"op": "update", "id": ids["Desk"], "name": "Old desk"},
+            _create("Desk", category, "40"),
+        ],
+    )
+    assert results == [
+        ("delete", "deleted", None),
+        ("create", "created", None),
+        ("create", "error", DUPLICATE_NAME),
+        ("update", "updated", None),
+        ("create", "created", None),
+    ]
+    assert _active_products(run, category) == [
+        ("Desk", 40),
+        ("Lamp", 30),
+        ("Old desk", 10),
+    ]
+
+
+def test_rename_taken_concurrently_fails_only_that_update(run, category):
+    _create_products(
+        run,
+        _create("Lamp", category),
+        _create("Desk", category),
+        _create("Chair", category),
+    )
+    ids = _ids(run, category)
+
+    async def update():
+        # As if another request renamed a product to "Lamp" after the check
+        items = [{"status": "updated"}, {"status": "updated"}]
+        rows = [
+            {"id": ids["Desk"], "name": "Lamp"},
+            {"id": ids["Chair"], "name": "Stool"},
+        ]
+        async with AsyncSessionLocal() as db:
+            await repository._update_batch_products(db, list(zip(items, rows)))
+            await db.commit()
+        return items
+
+    items = run(update())
+    assert [item["status"] for item in items] == ["error", "updated"]
+    assert _active_products(run, category) == [
+        ("Desk", 10),
+        ("Lamp", 10),
+        ("Stool", 10),
+    ]
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import text
+from app.api.v1.product import repository
+from app.db.session import AsyncSessionLocal
+
+
+@pytest.fixture
+def trgm(run, database):
+    async def installed():
+        async with database.connect() as conn:
+            result = await conn.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+            return result.scalar()
+
+    if not run(installed()):
+        pytest.skip("pg_trgm is not installed in the test database")
+
+
+def test_search_tolerates_typos(run, database, trgm, category):
+    async def search():
+        async with database.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO products (id, name, description, price, stock,"
+                    " category_id, is_active, created_at, updated_at) VALUES"
+                    " (gen_random_uuid(), 'Leather sneaker', 'White, low-top',"
+                    " 79, 3, :id, true, now(), now()),"
+                    " (gen_random_uuid(), 'Wool scarf', 'Grey', 25, 3, :id,"
+                    " true, now(), now())"
+                ),
+                {"id": category},
+            )
+        async with AsyncSessionLocal() as db:
+            products = await repository.search_products(
+                db, "sneakr", category_id=category
+            )
+            return [(p.name, p.rank) for p in products]
+
+    # No lexeme matches the misspelling, only the trigram similarity does
+    results = run(search())
+    assert [name for name, _ in results] == ["Leather sneaker"]
+    assert results[0][1] > 0
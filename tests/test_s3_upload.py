@@ -0,0 +1,89 @@
+import tempfile
+import threading
+import tracemalloc
+import pytest
+from fastapi import UploadFile
+from moto import mock_aws
+from starlette.datastructures import Headers
+from app.services import s3_service
+
+MB = 1024 * 1024
+
+
+class SerializedClient:
+    # moto's S3 backend isn't thread-safe (an abort can iterate the parts
+    # while an executor thread is still adding one), so let one call into it
+    # at a time. Uploads still run their parts as concurrent tasks.
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return method(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    monkeypatch.setattr(s3_service, "s3", SerializedClient(s3_service.s3))
+    with mock_aws():
+        s3_service.s3.create_bucket(Bucket=s3_service.PRODUCT_BUCKET)
+        s3_service._known_objects.clear()
+        yield s3_service.PRODUCT_BUCKET
+
+
+def _upload_file(size: int) -> UploadFile:
+    fileobj = tempfile.TemporaryFile()
+    block = bytes(range(256)) * 4096
+    for offset in range(0, size, len(block)):
+        fileobj.write(block[: size - offset])
+    fileobj.seek(0)
+    headers = Headers({"content-type": "image/png"})
+    return UploadFile(file=fileobj, size=size, headers=headers)
+
+
+def test_large_upload_streams_in_bounded_memory(run, bucket, monkeypatch):
+    size = 64 * MB
+    monkeypatch.setattr(s3_service, "SIZE_OF_IMAGE", size)
+    file = _upload_file(size)
+
+    # moto keeps every part in memory itself, so count only what the upload
+    # path holds: buffers allocated in s3_service, sampled as each part is sent
+    only_s3_service = [tracemalloc.Filter(True, s3_service.__file__)]
+    held = []
+    call_s3 = s3_service._call_s3
+
+    async def spy(operation, **kwargs):
+        if operation == "upload_part":
+            snapshot = tracemalloc.take_snapshot().filter_traces(only_s3_service)
+            held.append(sum(stat.size for stat in snapshot.statistics("filename")))
+            # moto holds on to the body it's given; hand it a copy so it
+            # doesn't pin the upload path's buffer
+            kwargs["Body"] = bytes(bytearray(kwargs["Body"]))
+        return await call_s3(operation, **kwargs)
+
+    monkeypatch.setattr(s3_service, "_call_s3", spy)
+    tracemalloc.start()
+    try:
+        key = run(s3_service.save_file_to_s3(file, bucket))
+    finally:
+        tracemalloc.stop()
+
+    head = s3_service.s3.head_object(Bucket=bucket, Key=key)
+    assert head["ContentLength"] == size
+    assert len(held) == size // s3_service.MULTIPART_PART_SIZE + 1
+    # Parts in flight plus the one being read, regardless of the file size
+    bound = (s3_service.MULTIPART_CONCURRENCY + 1) * s3_service.MULTIPART_PART_SIZE
+    assert max(held) <= bound + MB < size
+
+
+def test_oversized_upload_is_rejected_before_completion(run, bucket, monkeypatch):
+    monkeypatch.setattr(s3_service, "SIZE_OF_IMAGE", 12 * MB)
+    with pytest.raises(ValueError):
+        run(s3_service.save_file_to_s3(_upload_file(16 * MB), bucket))
+    assert s3_service.s3.list_multipart_uploads(Bucket=bucket).get("Uploads", []) == []